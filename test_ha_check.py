@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Unit tests for running Home Assistant's check_config in process."""
+
+import sys
+import threading
+import types
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from tools.ha_check import CheckResult, check_config_in_process
+
+CONFIG_DIR = Path("/config")
+
+
+class TestCheckConfigInProcess(unittest.TestCase):
+    """Test check_config_in_process against a stand-in check_config module."""
+
+    def install_check(self, check):
+        """Make check the check() of an importable homeassistant package."""
+        check_config = types.ModuleType("homeassistant.scripts.check_config")
+        check_config.check = check
+        scripts = types.ModuleType("homeassistant.scripts")
+        scripts.check_config = check_config
+        homeassistant = types.ModuleType("homeassistant")
+        homeassistant.scripts = scripts
+
+        patcher = mock.patch.dict(
+            sys.modules,
+            {
+                "homeassistant": homeassistant,
+                "homeassistant.scripts": scripts,
+                "homeassistant.scripts.check_config": check_config,
+            },
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_not_importable(self):
+        """Test that a missing homeassistant package gives None."""
+        with mock.patch.dict(sys.modules, {"homeassistant.scripts": None}):
+            self.assertIsNone(check_config_in_process(CONFIG_DIR, timeout=5))
+
+    def test_messages_from_check_result(self):
+        """Test that except/warn messages are mapped, skipping the configs."""
+        checked = []
+
+        def check(config_dir):
+            checked.append(config_dir)
+            return {
+                "except": {
+                    "light": ["Invalid config for light", {"platform": "x"}],
+                    "homeassistant.packages.lights": ["Package error"],
+                },
+                "warn": {"sensor": ["Deprecated option", {"name": "y"}]},
+            }
+
+        self.install_check(check)
+        result = check_config_in_process(CONFIG_DIR, timeout=5)
+
+        self.assertEqual(checked, [str(CONFIG_DIR)])
+        self.assertEqual(
+            result,
+            CheckResult(
+                False,
+                [
+                    "HA Check: light: Invalid config for light",
+                    "HA Check: homeassistant.packages.lights: Package error",
+                ],
+                ["HA Check: sensor: Deprecated option"],
+            ),
+        )
+
+    def test_valid_without_warn_key(self):
+        """Test that a result without a "warn" key is valid with no warnings."""
+        self.install_check(lambda config_dir: {"except": {}})
+
+        result = check_config_in_process(CONFIG_DIR, timeout=5)
+        self.assertEqual(result, CheckResult(True, [], []))
+
+    def test_timeout(self):
+        """Test that a check running past the timeout raises TimeoutError."""
+        release = threading.Event()
+        # Let the abandoned worker thread finish once the test is done
+        self.addCleanup(release.set)
+
+        def check(config_dir):
+            release.wait()
+            return {"except": {}, "warn": {}}
+
+        self.install_check(check)
+        with self.assertRaises(TimeoutError):
+            check_config_in_process(CONFIG_DIR, timeout=0.05)
+
+    def test_exception_is_reraised(self):
+        """Test that an error raised by check() reaches the caller unchanged."""
+
+        def check(config_dir):
+            raise ValueError("broken config")
+
+        self.install_check(check)
+        with self.assertRaisesRegex(ValueError, "broken config"):
+            check_config_in_process(CONFIG_DIR, timeout=5)
+
+    def test_system_exit_becomes_runtime_error(self):
+        """Test that SystemExit from check() is raised as RuntimeError."""
+
+        def check(config_dir):
+            sys.exit(3)
+
+        self.install_check(check)
+        with self.assertRaises(RuntimeError) as cm:
+            check_config_in_process(CONFIG_DIR, timeout=5)
+        self.assertIsInstance(cm.exception.__cause__, SystemExit)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,28 +2,103 @@
 """Unit tests for reference_validator.py UUID support."""
 
 import json
-import shutil
+import os
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 import yaml
 
 from tools.reference_validator import ReferenceValidator
 
+# Prefer the libyaml-backed emitter; fall back to pure Python if unavailable
+YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# Keep fixtures in RAM when a writable tmpfs is available
+TEMP_ROOT = "/dev/shm" if os.access("/dev/shm", os.W_OK) else None
+
+# Expected results, built once at import
+EXPECTED_REGISTRY_ID_MAPPING = {
+    "88a52f17bf43cb276836f06ac5c07444": "binary_sensor.test_motion_battery",
+    "11223344556677889900aabbccddeeff": "sensor.disabled_sensor",
+    "aabbccddeeff00112233445566778899": "sensor.normal_sensor",
+    "complexsensoridfortest12345678900": "sensor.complex",
+}
+EXPECTED_REFS_EXCLUDING_UUIDS = frozenset(
+    {"sensor.normal_entity", "binary_sensor.another_sensor"}
+)
+EXPECTED_REFS_WITH_TEMPLATES = frozenset({"sensor.normal", "binary_sensor.door"})
+EXPECTED_REFS_WITH_BLUEPRINT_INPUTS = frozenset({"binary_sensor.actual_door"})
+
+# Automation with both normal entity IDs and registry UUIDs
+MIXED_ENTITY_FORMATS_AUTOMATION = [
+    {
+        "id": "mixed_automation",
+        "triggers": [
+            {
+                "platform": "state",
+                "entity_id": "binary_sensor.test_motion_battery",  # Normal
+            },
+            {
+                "entity_id": "88a52f17bf43cb276836f06ac5c07444",  # UUID format
+                "platform": "device",
+            },
+        ],
+    }
+]
+
+# Automation mixing templates, UUIDs and special keywords
+MIXED_ENTITY_TYPES_AUTOMATION = [
+    {
+        "id": "complex_automation",
+        "alias": "Complex Mixed Automation",
+        "trigger": {
+            "platform": "template",
+            # Template, should be ignored
+            "value_template": "{{ states('sensor.complex') == 'on' }}",
+        },
+        "condition": [
+            {
+                "condition": "state",
+                "entity_id": "88a52f17bf43cb276836f06ac5c07444",  # Valid UUID
+                "state": "on",
+            }
+        ],
+        "action": [
+            {
+                "service": "light.turn_on",
+                "target": {
+                    "entity_id": ["all"]  # Special keyword, should be ignored
+                },
+            },
+            {
+                "service": "notify.send",
+                "data": {
+                    "message": "{{ now() }} - Motion detected"  # Template in data
+                },
+            },
+        ],
+    }
+]
 
-class TestReferenceValidatorUUID(unittest.TestCase):
-    """Test UUID support in reference validator."""
+# File payloads for the file-based tests, rendered once at import
+PRERENDERED = {
+    "mixed_entity_formats": json.dumps(MIXED_ENTITY_FORMATS_AUTOMATION).encode(),
+    "mixed_entity_types": yaml.dump(
+        MIXED_ENTITY_TYPES_AUTOMATION, Dumper=YamlDumper
+    ).encode(),
+}
 
-    def setUp(self):
-        """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.config_dir = Path(self.temp_dir)
-        self.storage_dir = self.config_dir / ".storage"
-        self.storage_dir.mkdir(exist_ok=True)
 
+class _RegistryFixtureTestCase(unittest.TestCase):
+    """Shared entity/device/area registry fixtures."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Build the registry fixtures and their JSON payloads once."""
         # Create mock entity registry
-        self.entity_registry_data = {
+        cls.entity_registry_data = {
             "version": 1,
             "minor_version": 1,
             "data": {
@@ -63,7 +138,7 @@ class TestReferenceValidatorUUID(unittest.TestCase):
         }
 
         # Create mock device registry
-        self.device_registry_data = {
+        cls.device_registry_data = {
             "version": 1,
             "minor_version": 1,
             "data": {
@@ -85,9 +160,9 @@ class TestReferenceValidatorUUID(unittest.TestCase):
                 ]
             },
         }
-        
-        # Create mock area registry  
-        self.area_registry_data = {
+
+        # Create mock area registry
+        cls.area_registry_data = {
             "version": 1,
             "minor_version": 1,
             "data": {
@@ -100,20 +175,37 @@ class TestReferenceValidatorUUID(unittest.TestCase):
             }
         }
 
-        # Write registry files
-        with open(self.storage_dir / "core.entity_registry", "w") as f:
-            json.dump(self.entity_registry_data, f)
-
-        with open(self.storage_dir / "core.device_registry", "w") as f:
-            json.dump(self.device_registry_data, f)
-            
-        with open(self.storage_dir / "core.area_registry", "w") as f:
-            json.dump(self.area_registry_data, f)
-        self.validator = ReferenceValidator(str(self.config_dir))
-
-    def tearDown(self):
-        """Clean up test fixtures."""
-        shutil.rmtree(self.temp_dir)
+        # Serialize once; each test only writes the prebuilt bytes
+        cls._entity_registry_bytes = json.dumps(cls.entity_registry_data).encode()
+        cls._device_registry_bytes = json.dumps(cls.device_registry_data).encode()
+        cls._area_registry_bytes = json.dumps(cls.area_registry_data).encode()
+
+    @classmethod
+    def write_registries(cls, storage_dir: Path):
+        """Write the prebuilt registry payloads into a .storage directory."""
+        storage_dir.mkdir(exist_ok=True)
+        (storage_dir / "core.entity_registry").write_bytes(cls._entity_registry_bytes)
+        (storage_dir / "core.device_registry").write_bytes(cls._device_registry_bytes)
+        (storage_dir / "core.area_registry").write_bytes(cls._area_registry_bytes)
+
+
+class TestReferenceValidatorUUID(_RegistryFixtureTestCase):
+    """Test UUID support in reference validator.
+
+    These tests never touch the registries or the validator's error lists,
+    so a single validator is shared across the whole class.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Write the registries and build the shared validator once."""
+        super().setUpClass()
+        temp_dir = tempfile.TemporaryDirectory(dir=TEMP_ROOT)
+        cls.addClassCleanup(temp_dir.cleanup)
+        cls.temp_dir = temp_dir.name
+        cls.config_dir = Path(cls.temp_dir)
+        cls.write_registries(cls.config_dir / ".storage")
+        cls.validator = ReferenceValidator(str(cls.config_dir))
 
     def test_is_uuid_format(self):
         """Test UUID format detection."""
@@ -177,129 +269,7 @@ class TestReferenceValidatorUUID(unittest.TestCase):
     def test_get_entity_registry_id_mapping(self):
         """Test entity registry ID to entity_id mapping."""
         mapping = self.validator.get_entity_registry_id_mapping()
-
-        expected_mapping = {
-            "88a52f17bf43cb276836f06ac5c07444": "binary_sensor.test_motion_battery",
-            "11223344556677889900aabbccddeeff": "sensor.disabled_sensor",
-            "aabbccddeeff00112233445566778899": "sensor.normal_sensor",
-            "complexsensoridfortest12345678900": "sensor.complex",
-        }
-
-        self.assertEqual(mapping, expected_mapping)
-
-    def test_validate_valid_entity_registry_id(self):
-        """Test validation of valid entity registry ID."""
-        # Create a test automation file with UUID entity reference
-        automation_data = [
-            {
-                "id": "test_automation",
-                "alias": "Test Device Automation",
-                "triggers": [
-                    {
-                        "type": "battery_level",
-                        "device_id": "0c086f69ee6b3fa8411af7194876cbd7",
-                        "entity_id": "88a52f17bf43cb276836f06ac5c07444",  # Valid UUID
-                        "domain": "sensor",
-                        "trigger": "device",
-                        "below": 20,
-                    }
-                ],
-                "action": [
-                    {"service": "notify.mobile_app", "data": {"message": "Low battery"}}
-                ],
-            }
-        ]
-
-        test_file = self.config_dir / "test_automation.yaml"
-        with open(test_file, "w") as f:
-            yaml.dump(automation_data, f)
-
-        # Validate the file
-        result = self.validator.validate_file_references(test_file)
-        self.assertTrue(result)
-        self.assertEqual(len(self.validator.errors), 0)
-
-    def test_validate_invalid_entity_registry_id(self):
-        """Test validation of invalid entity registry ID."""
-        # Create test automation with invalid UUID (32 hex chars but not in registry)
-        automation_data = [
-            {
-                "id": "test_automation",
-                "alias": "Test Device Automation",
-                "triggers": [
-                    {
-                        "entity_id": "ffffffffffffffffffffffffffffffff",  # 32 hex chars
-                        "platform": "state",
-                    }
-                ],
-            }
-        ]
-
-        test_file = self.config_dir / "test_automation.yaml"
-        with open(test_file, "w") as f:
-            yaml.dump(automation_data, f)
-
-        # Validate the file
-        result = self.validator.validate_file_references(test_file)
-        self.assertFalse(result)
-        self.assertTrue(
-            any(
-                "Unknown entity registry ID" in error for error in self.validator.errors
-            )
-        )
-
-    def test_validate_disabled_entity_registry_id(self):
-        """Test validation of entity registry ID pointing to disabled entity."""
-        # Create test automation with UUID pointing to disabled entity
-        automation_data = [
-            {
-                "id": "test_automation",
-                "triggers": [
-                    {
-                        "entity_id": "11223344556677889900aabbccddeeff",  # UUID
-                        "platform": "state",
-                    }
-                ],
-            }
-        ]
-
-        test_file = self.config_dir / "test_automation.yaml"
-        with open(test_file, "w") as f:
-            yaml.dump(automation_data, f)
-
-        # Validate the file
-        result = self.validator.validate_file_references(test_file)
-        self.assertTrue(result)  # Should pass validation but generate warning
-        self.assertTrue(
-            any("disabled entity" in warning for warning in self.validator.warnings)
-        )
-
-    def test_validate_mixed_entity_formats(self):
-        """Test validation with both normal entity IDs and registry UUIDs."""
-        automation_data = [
-            {
-                "id": "mixed_automation",
-                "triggers": [
-                    {
-                        "platform": "state",
-                        "entity_id": "binary_sensor.test_motion_battery",  # Normal
-                    },
-                    {
-                        "entity_id": "88a52f17bf43cb276836f06ac5c07444",  # UUID format
-                        "platform": "device",
-                    },
-                ],
-            }
-        ]
-
-        test_file = self.config_dir / "test_automation.yaml"
-        with open(test_file, "w") as f:
-            yaml.dump(automation_data, f)
-
-        # Validate the file
-        result = self.validator.validate_file_references(test_file)
-        self.assertTrue(result)
-        self.assertEqual(len(self.validator.errors), 0)
+        self.assertEqual(mapping, EXPECTED_REGISTRY_ID_MAPPING)
 
     def test_extract_entity_references_excludes_uuids(self):
         """Test that normal entity reference extraction excludes UUIDs."""
@@ -319,8 +289,7 @@ class TestReferenceValidatorUUID(unittest.TestCase):
 
         entity_refs = self.validator.extract_entity_references(mixed_data)
         # Should only contain normal format entity IDs
-        expected_refs = {"sensor.normal_entity", "binary_sensor.another_sensor"}
-        self.assertEqual(entity_refs, expected_refs)
+        self.assertEqual(entity_refs, EXPECTED_REFS_EXCLUDING_UUIDS)
 
     def test_is_template(self):
         """Test template detection."""
@@ -372,8 +341,20 @@ class TestReferenceValidatorUUID(unittest.TestCase):
         }
         
         entity_refs = self.validator.extract_entity_references(config_data)
-        expected_refs = {"sensor.normal", "binary_sensor.door"}
-        self.assertEqual(entity_refs, expected_refs)
+        self.assertEqual(entity_refs, EXPECTED_REFS_WITH_TEMPLATES)
+
+    def test_extract_entities_from_template_with_spaces(self):
+        """Test template extraction accepts spaces inside call parentheses."""
+        template = (
+            "{{ states( 'sensor.spaced' ) }} "
+            "{{ is_state( \"light.spaced\", 'on') }} "
+            "{{ state_attr('climate.plain', 'temperature') }}"
+        )
+
+        entity_refs = self.validator.extract_entities_from_template(template)
+        self.assertEqual(
+            entity_refs, {"sensor.spaced", "light.spaced", "climate.plain"}
+        )
 
     def test_extract_entity_references_with_blueprint_inputs(self):
         """Test entity reference extraction skips blueprint inputs."""
@@ -387,51 +368,207 @@ class TestReferenceValidatorUUID(unittest.TestCase):
         }
         
         entity_refs = self.validator.extract_entity_references(blueprint_data)
-        expected_refs = {"binary_sensor.actual_door"}
-        self.assertEqual(entity_refs, expected_refs)
+        self.assertEqual(entity_refs, EXPECTED_REFS_WITH_BLUEPRINT_INPUTS)
 
     def test_special_keywords_class_variable(self):
         """Test that special keywords are defined as class variable."""
         self.assertIn("all", ReferenceValidator.SPECIAL_KEYWORDS)
         self.assertIn("none", ReferenceValidator.SPECIAL_KEYWORDS)
-        self.assertIsInstance(ReferenceValidator.SPECIAL_KEYWORDS, set)
+        self.assertIsInstance(ReferenceValidator.SPECIAL_KEYWORDS, frozenset)
+
+
+class TestReferenceValidatorFiles(_RegistryFixtureTestCase):
+    """Test file validation, which records errors and warnings per test."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        temp_dir = tempfile.TemporaryDirectory(dir=TEMP_ROOT)
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
+        self.config_dir = Path(self.temp_dir)
+        self.storage_dir = self.config_dir / ".storage"
+        self.write_registries(self.storage_dir)
+        self.validator = ReferenceValidator(str(self.config_dir))
+
+    def test_validate_valid_entity_registry_id(self):
+        """Test validation of valid entity registry ID."""
+        # Create a test automation file with UUID entity reference
+        automation_data = [
+            {
+                "id": "test_automation",
+                "alias": "Test Device Automation",
+                "triggers": [
+                    {
+                        "type": "battery_level",
+                        "device_id": "0c086f69ee6b3fa8411af7194876cbd7",
+                        "entity_id": "88a52f17bf43cb276836f06ac5c07444",  # Valid UUID
+                        "domain": "sensor",
+                        "trigger": "device",
+                        "below": 20,
+                    }
+                ],
+                "action": [
+                    {"service": "notify.mobile_app", "data": {"message": "Low battery"}}
+                ],
+            }
+        ]
+
+        # Validate the data directly; no file round-trip is needed
+        result = self.validator.validate_data_references(
+            automation_data, Path("test_automation.yaml")
+        )
+        self.assertTrue(result)
+        self.assertEqual(len(self.validator.errors), 0)
+
+    def test_validate_invalid_entity_registry_id(self):
+        """Test validation of invalid entity registry ID."""
+        # Create test automation with invalid UUID (32 hex chars but not in registry)
+        automation_data = [
+            {
+                "id": "test_automation",
+                "alias": "Test Device Automation",
+                "triggers": [
+                    {
+                        "entity_id": "ffffffffffffffffffffffffffffffff",  # 32 hex chars
+                        "platform": "state",
+                    }
+                ],
+            }
+        ]
+
+        # Validate the data directly; no file round-trip is needed
+        result = self.validator.validate_data_references(
+            automation_data, Path("test_automation.yaml")
+        )
+        self.assertFalse(result)
+        self.assertTrue(
+            any(
+                "Unknown entity registry ID" in error for error in self.validator.errors
+            )
+        )
+
+    def test_validate_disabled_entity_registry_id(self):
+        """Test validation of entity registry ID pointing to disabled entity."""
+        # Create test automation with UUID pointing to disabled entity
+        automation_data = [
+            {
+                "id": "test_automation",
+                "triggers": [
+                    {
+                        "entity_id": "11223344556677889900aabbccddeeff",  # UUID
+                        "platform": "state",
+                    }
+                ],
+            }
+        ]
+
+        # Validate the data directly; no file round-trip is needed
+        result = self.validator.validate_data_references(
+            automation_data, Path("test_automation.yaml")
+        )
+        self.assertTrue(result)  # Should pass validation but generate warning
+        self.assertTrue(
+            any("disabled entity" in warning for warning in self.validator.warnings)
+        )
+
+    def test_validate_malformed_entity_id(self):
+        """Test that entity IDs without exactly one dot are reported as invalid."""
+        automation_data = [
+            {
+                "id": "test_automation",
+                "triggers": [{"entity_id": "motion_sensor", "platform": "state"}],
+                "actions": [{"entity_id": "light.kitchen.main"}],
+            }
+        ]
+
+        result = self.validator.validate_data_references(
+            automation_data, Path("test_automation.yaml")
+        )
+        self.assertFalse(result)
+        self.assertCountEqual(
+            self.validator.errors,
+            [
+                "test_automation.yaml: Invalid entity ID 'motion_sensor'",
+                "test_automation.yaml: Invalid entity ID 'light.kitchen.main'",
+            ],
+        )
+
+    def test_missing_entity_registry_reported_once(self):
+        """Test that loading the registry index reports a missing registry once."""
+        (self.storage_dir / "core.entity_registry").unlink()
+
+        index = self.validator.load_registry_index()
+        self.assertEqual(index.registry_id_map, {})
+        self.assertEqual(
+            [e for e in self.validator.errors if "Entity registry not found" in e],
+            [f"Entity registry not found: {self.storage_dir / 'core.entity_registry'}"],
+        )
+
+    def test_validate_malformed_file_without_references(self):
+        """Test that a syntax error is reported even with no reference keys."""
+        test_file = self.config_dir / "broken.yaml"
+        test_file.write_text("homeassistant:\n  name: [Home\n")
+
+        result = self.validator.validate_file_references(test_file)
+        self.assertFalse(result)
+        self.assertEqual(len(self.validator.errors), 1)
+        self.assertIn("Failed to load YAML", self.validator.errors[0])
+
+    def test_validate_mixed_entity_formats(self):
+        """Test validation with both normal entity IDs and registry UUIDs."""
+        test_file = self.config_dir / "test_automation.json"
+        test_file.write_bytes(PRERENDERED["mixed_entity_formats"])
+
+        # Validate the file
+        result = self.validator.validate_file_references(test_file)
+        self.assertTrue(result)
+        self.assertEqual(len(self.validator.errors), 0)
 
     def test_validate_file_with_mixed_entity_types(self):
         """Test validation with templates, UUIDs, and normal entities mixed."""
-        automation_data = [{
-            "id": "complex_automation",
-            "alias": "Complex Mixed Automation",
-            "trigger": {
-                "platform": "template",
-                "value_template": "{{ states('sensor.complex') == 'on' }}"  # Template, should be ignored
-            },
-            "condition": [{
-                "condition": "state",
-                "entity_id": "88a52f17bf43cb276836f06ac5c07444",  # Valid UUID
-                "state": "on"
-            }],
-            "action": [{
-                "service": "light.turn_on",
-                "target": {
-                    "entity_id": ["all"]  # Special keyword, should be ignored
-                }
-            }, {
-                "service": "notify.send",
-                "data": {
-                    "message": "{{ now() }} - Motion detected"  # Template in data
-                }
-            }]
-        }]
-        
         test_file = self.config_dir / "complex_test.yaml"
-        with open(test_file, "w") as f:
-            yaml.dump(automation_data, f)
-        
+        test_file.write_bytes(PRERENDERED["mixed_entity_types"])
+
         # Should validate successfully
         result = self.validator.validate_file_references(test_file)
         self.assertTrue(result)
         self.assertEqual(len(self.validator.errors), 0)
 
+    def test_parallel_validation_matches_serial(self):
+        """Test that the process pool gives the same result as the serial loop."""
+        # Enough files for the pool, each mixing good and bad references
+        for i in range(10):
+            automation = [
+                {
+                    "id": f"automation_{i}",
+                    "triggers": [{"entity_id": "sensor.normal_sensor"}],
+                    "actions": [
+                        {"entity_id": f"light.missing_{i}"},
+                        {"entity_id": "sensor.disabled_sensor"},
+                        {"device_id": "0c086f69ee6b3fa8411af7194876cbd7"},
+                        {"area_id": f"area_{i % 3}"},
+                    ],
+                }
+            ]
+            (self.config_dir / f"automations_{i:02}.yaml").write_text(
+                yaml.dump(automation, Dumper=YamlDumper)
+            )
+        (self.config_dir / "broken.yaml").write_text("name: [Home\n")
+
+        def run(parallel: bool):
+            validator = ReferenceValidator(str(self.config_dir))
+            min_files = 8 if parallel else 10**6
+            with mock.patch("tools.reference_validator._PARALLEL_MIN_FILES", min_files):
+                # The pool is only used with more than one CPU
+                with mock.patch("os.cpu_count", return_value=4):
+                    valid = validator.validate_all()
+            return valid, validator.errors, validator.warnings
+
+        serial = run(parallel=False)
+        self.assertFalse(serial[0])
+        self.assertEqual(len(serial[1]), 11)
+        self.assertEqual(run(parallel=True), serial)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,49 +1,164 @@
 #!/usr/bin/env python3
 """Unit tests for validator improvements including blueprint support and validation."""
 
+import json
+import shutil
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 from tools.yaml_validator import YAMLValidator
 from tools.ha_config_validator import HAConfigValidator
 import yaml
 
+# Prefer the libyaml-backed emitter; fall back to pure Python if unavailable
+YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+FIXTURE_DATA = {
+    # Blueprint automation using use_blueprint instead of triggers/actions
+    "blueprint_automation": [
+        {
+            "id": "blueprint_test",
+            "alias": "Motion-activated Light",
+            "use_blueprint": {
+                "path": "homeassistant/motion_light.yaml",
+                "input": {
+                    "motion_entity": "binary_sensor.motion",
+                    "light_target": "light.living_room",
+                },
+            },
+        }
+    ],
+    "automation_with_plurals": [
+        {
+            "id": "plural_test",
+            "alias": "Automation with plural fields",
+            "triggers": [  # plural form
+                {"platform": "state", "entity_id": "sensor.test"},
+                {"platform": "time", "at": "12:00:00"},
+            ],
+            "actions": [  # plural form
+                {"service": "light.turn_on", "entity_id": "light.test"},
+                {"service": "notify.send", "data": {"message": "Test"}},
+            ],
+        }
+    ],
+    "automation_with_singulars": [
+        {
+            "id": "singular_test",
+            "alias": "Automation with singular fields",
+            # singular forms
+            "trigger": {"platform": "state", "entity_id": "sensor.test"},
+            "action": {"service": "light.turn_on", "entity_id": "light.test"},
+        }
+    ],
+    "invalid_automation": [
+        {
+            "id": "invalid_test",
+            "alias": "Invalid automation - missing triggers/actions",
+            # Missing both trigger/triggers and action/actions
+        }
+    ],
+    "blueprint_scripts": {
+        "blueprint_script": {
+            "alias": "Blueprint Script",
+            "use_blueprint": {
+                "path": "custom/notification_script.yaml",
+                "input": {"message": "Test message", "target": "mobile_app"},
+            },
+        }
+    },
+    "regular_scripts": {
+        "regular_script": {
+            "alias": "Regular Script",
+            "sequence": [
+                {"service": "light.turn_on", "entity_id": "light.test"},
+                {"delay": {"seconds": 5}},
+                {"service": "light.turn_off", "entity_id": "light.test"},
+            ],
+        }
+    },
+    "invalid_scripts": {
+        "invalid_script": {
+            "alias": "Invalid Script",
+            # Missing both sequence and use_blueprint
+        }
+    },
+    "ha_blueprint_automation": [
+        {
+            "id": "ha_blueprint_test",
+            "alias": "HA Blueprint Test",
+            "use_blueprint": {"path": "test.yaml", "input": {"entity": "sensor.test"}},
+        }
+    ],
+    "ha_blueprint_scripts": {
+        "ha_blueprint_script": {
+            "alias": "HA Blueprint Script",
+            "use_blueprint": {"path": "test_script.yaml", "input": {"message": "test"}},
+        }
+    },
+    "mixed_automations": [
+        {
+            "id": "blueprint_auto",
+            "alias": "Blueprint Automation",
+            "use_blueprint": {
+                "path": "motion.yaml",
+                "input": {"sensor": "binary_sensor.motion"},
+            },
+        },
+        {
+            "id": "regular_auto",
+            "alias": "Regular Automation",
+            "trigger": {"platform": "state", "entity_id": "sensor.temp"},
+            "action": {
+                "service": "climate.set_temperature",
+                "data": {"temperature": 20},
+            },
+        },
+        {
+            "id": "plural_auto",
+            "alias": "Plural Automation",
+            "triggers": [{"platform": "time", "at": "08:00:00"}],
+            "actions": [{"service": "light.turn_on"}],
+        },
+    ],
+}
+
+# The fixtures never change, so render them to YAML once at import
+FIXTURES = {
+    name: yaml.dump(data, Dumper=YamlDumper).encode()
+    for name, data in FIXTURE_DATA.items()
+}
+
 
 class TestValidatorImprovements(unittest.TestCase):
     """Test validator improvements for blueprint support and automation validation."""
 
     def setUp(self):
         """Set up test fixtures."""
+        # A fresh directory per test, so no test sees files another one wrote
         self.temp_dir = tempfile.mkdtemp()
         self.config_dir = Path(self.temp_dir)
-        
+
+        # Fresh validators as well: besides the message lists, HAConfigValidator
+        # keeps parsed files and its Home Assistant probe result between calls
         self.yaml_validator = YAMLValidator(str(self.config_dir))
         self.ha_validator = HAConfigValidator(str(self.config_dir))
 
     def tearDown(self):
         """Clean up test fixtures."""
-        import shutil
         shutil.rmtree(self.temp_dir)
 
+    def write_fixture(self, filename: str, name: str) -> Path:
+        """Write a prerendered fixture into the config directory."""
+        path = self.config_dir / filename
+        path.write_bytes(FIXTURES[name])
+        return path
+
     def test_blueprint_automation_validation(self):
         """Test that blueprint-based automations pass validation."""
-        # Blueprint automation using use_blueprint instead of triggers/actions
-        blueprint_automation = [{
-            "id": "blueprint_test",
-            "alias": "Motion-activated Light",
-            "use_blueprint": {
-                "path": "homeassistant/motion_light.yaml",
-                "input": {
-                    "motion_entity": "binary_sensor.motion",
-                    "light_target": "light.living_room"
-                }
-            }
-        }]
-        
-        automations_file = self.config_dir / "automations.yaml"
-        with open(automations_file, "w") as f:
-            yaml.dump(blueprint_automation, f)
-        
+        automations_file = self.write_fixture("automations.yaml", "blueprint_automation")
+
         # Should pass validation with both validators
         result = self.yaml_validator.validate_automations_structure(automations_file)
         self.assertTrue(result)
@@ -51,23 +166,10 @@ class TestValidatorImprovements(unittest.TestCase):
 
     def test_plural_triggers_actions_validation(self):
         """Test that automations with plural triggers/actions pass validation."""
-        automation_with_plurals = [{
-            "id": "plural_test",
-            "alias": "Automation with plural fields",
-            "triggers": [  # plural form
-                {"platform": "state", "entity_id": "sensor.test"},
-                {"platform": "time", "at": "12:00:00"}
-            ],
-            "actions": [  # plural form
-                {"service": "light.turn_on", "entity_id": "light.test"},
-                {"service": "notify.send", "data": {"message": "Test"}}
-            ]
-        }]
-        
-        automations_file = self.config_dir / "automations.yaml"
-        with open(automations_file, "w") as f:
-            yaml.dump(automation_with_plurals, f)
-        
+        automations_file = self.write_fixture(
+            "automations.yaml", "automation_with_plurals"
+        )
+
         # Should pass validation
         result = self.yaml_validator.validate_automations_structure(automations_file)
         self.assertTrue(result)
@@ -75,17 +177,10 @@ class TestValidatorImprovements(unittest.TestCase):
 
     def test_singular_triggers_actions_validation(self):
         """Test that automations with singular triggers/actions still pass validation."""
-        automation_with_singulars = [{
-            "id": "singular_test", 
-            "alias": "Automation with singular fields",
-            "trigger": {"platform": "state", "entity_id": "sensor.test"},  # singular form
-            "action": {"service": "light.turn_on", "entity_id": "light.test"}  # singular form
-        }]
-        
-        automations_file = self.config_dir / "automations.yaml"
-        with open(automations_file, "w") as f:
-            yaml.dump(automation_with_singulars, f)
-        
+        automations_file = self.write_fixture(
+            "automations.yaml", "automation_with_singulars"
+        )
+
         # Should pass validation
         result = self.yaml_validator.validate_automations_structure(automations_file)
         self.assertTrue(result)
@@ -93,41 +188,22 @@ class TestValidatorImprovements(unittest.TestCase):
 
     def test_automation_missing_required_fields(self):
         """Test that automations missing both trigger forms fail validation."""
-        invalid_automation = [{
-            "id": "invalid_test",
-            "alias": "Invalid automation - missing triggers/actions",
-            # Missing both trigger/triggers and action/actions
-        }]
-        
-        automations_file = self.config_dir / "automations.yaml"
-        with open(automations_file, "w") as f:
-            yaml.dump(invalid_automation, f)
-        
+        automations_file = self.write_fixture("automations.yaml", "invalid_automation")
+
         # Should fail validation
         result = self.yaml_validator.validate_automations_structure(automations_file)
         self.assertFalse(result)
-        self.assertTrue(any("missing" in error and "trigger" in error for error in self.yaml_validator.errors))
-        self.assertTrue(any("missing" in error and "action" in error for error in self.yaml_validator.errors))
+        self.assertTrue(
+            any("missing" in e and "trigger" in e for e in self.yaml_validator.errors)
+        )
+        self.assertTrue(
+            any("missing" in e and "action" in e for e in self.yaml_validator.errors)
+        )
 
     def test_blueprint_script_validation(self):
         """Test that blueprint-based scripts pass validation."""
-        blueprint_scripts = {
-            "blueprint_script": {
-                "alias": "Blueprint Script",
-                "use_blueprint": {
-                    "path": "custom/notification_script.yaml",
-                    "input": {
-                        "message": "Test message",
-                        "target": "mobile_app"
-                    }
-                }
-            }
-        }
-        
-        scripts_file = self.config_dir / "scripts.yaml"
-        with open(scripts_file, "w") as f:
-            yaml.dump(blueprint_scripts, f)
-        
+        scripts_file = self.write_fixture("scripts.yaml", "blueprint_scripts")
+
         # Should pass validation
         result = self.yaml_validator.validate_scripts_structure(scripts_file)
         self.assertTrue(result)
@@ -135,21 +211,8 @@ class TestValidatorImprovements(unittest.TestCase):
 
     def test_regular_script_validation(self):
         """Test that regular scripts with sequence still pass validation."""
-        regular_scripts = {
-            "regular_script": {
-                "alias": "Regular Script",
-                "sequence": [
-                    {"service": "light.turn_on", "entity_id": "light.test"},
-                    {"delay": {"seconds": 5}},
-                    {"service": "light.turn_off", "entity_id": "light.test"}
-                ]
-            }
-        }
-        
-        scripts_file = self.config_dir / "scripts.yaml"
-        with open(scripts_file, "w") as f:
-            yaml.dump(regular_scripts, f)
-        
+        scripts_file = self.write_fixture("scripts.yaml", "regular_scripts")
+
         # Should pass validation
         result = self.yaml_validator.validate_scripts_structure(scripts_file)
         self.assertTrue(result)
@@ -157,100 +220,191 @@ class TestValidatorImprovements(unittest.TestCase):
 
     def test_script_missing_required_fields(self):
         """Test that scripts missing both sequence and use_blueprint fail validation."""
-        invalid_scripts = {
-            "invalid_script": {
-                "alias": "Invalid Script",
-                # Missing both sequence and use_blueprint
-            }
-        }
-        
-        scripts_file = self.config_dir / "scripts.yaml"  
-        with open(scripts_file, "w") as f:
-            yaml.dump(invalid_scripts, f)
-        
+        scripts_file = self.write_fixture("scripts.yaml", "invalid_scripts")
+
         # Should fail validation
         result = self.yaml_validator.validate_scripts_structure(scripts_file)
         self.assertFalse(result)
-        self.assertTrue(any("missing" in error and ("sequence" in error or "use_blueprint" in error) 
-                           for error in self.yaml_validator.errors))
+        self.assertTrue(
+            any(
+                "missing" in e and ("sequence" in e or "use_blueprint" in e)
+                for e in self.yaml_validator.errors
+            )
+        )
 
     def test_ha_config_validator_blueprint_automation(self):
         """Test HAConfigValidator with blueprint automations."""
-        blueprint_automation = [{
-            "id": "ha_blueprint_test",
-            "alias": "HA Blueprint Test",
-            "use_blueprint": {
-                "path": "test.yaml",
-                "input": {"entity": "sensor.test"}
-            }
-        }]
-        
-        automations_file = self.config_dir / "automations.yaml"
-        with open(automations_file, "w") as f:
-            yaml.dump(blueprint_automation, f)
-        
+        self.write_fixture("automations.yaml", "ha_blueprint_automation")
+
         # Validate using ha_config_validator
         self.ha_validator.validate_automations_file()
-        
+
         # Should pass without errors
         self.assertEqual(len(self.ha_validator.errors), 0)
 
     def test_ha_config_validator_blueprint_script(self):
-        """Test HAConfigValidator with blueprint scripts.""" 
-        blueprint_scripts = {
-            "ha_blueprint_script": {
-                "alias": "HA Blueprint Script",
-                "use_blueprint": {
-                    "path": "test_script.yaml",
-                    "input": {"message": "test"}
-                }
-            }
-        }
-        
-        scripts_file = self.config_dir / "scripts.yaml"
-        with open(scripts_file, "w") as f:
-            yaml.dump(blueprint_scripts, f)
-        
+        """Test HAConfigValidator with blueprint scripts."""
+        self.write_fixture("scripts.yaml", "ha_blueprint_scripts")
+
         # Validate using ha_config_validator
         self.ha_validator.validate_scripts_file()
-        
+
         # Should pass without errors
         self.assertEqual(len(self.ha_validator.errors), 0)
 
     def test_mixed_automation_validation(self):
         """Test validation with mix of blueprint and regular automations."""
-        mixed_automations = [
-            {
-                "id": "blueprint_auto",
-                "alias": "Blueprint Automation", 
-                "use_blueprint": {
-                    "path": "motion.yaml",
-                    "input": {"sensor": "binary_sensor.motion"}
-                }
-            },
-            {
-                "id": "regular_auto",
-                "alias": "Regular Automation",
-                "trigger": {"platform": "state", "entity_id": "sensor.temp"},
-                "action": {"service": "climate.set_temperature", "data": {"temperature": 20}}
-            },
-            {
-                "id": "plural_auto", 
-                "alias": "Plural Automation",
-                "triggers": [{"platform": "time", "at": "08:00:00"}],
-                "actions": [{"service": "light.turn_on"}]
-            }
-        ]
-        
-        automations_file = self.config_dir / "automations.yaml"
-        with open(automations_file, "w") as f:
-            yaml.dump(mixed_automations, f)
-        
+        automations_file = self.write_fixture("automations.yaml", "mixed_automations")
+
         # Should all pass validation
         result = self.yaml_validator.validate_automations_structure(automations_file)
         self.assertTrue(result)
         self.assertEqual(len(self.yaml_validator.errors), 0)
 
 
+class TestHAConfigValidatorResultCache(unittest.TestCase):
+    """Test caching of check_config results between validator runs."""
+
+    def setUp(self):
+        """Set up a config directory and an empty result cache directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_dir = Path(self.temp_dir) / "config"
+        (self.config_dir / ".storage").mkdir(parents=True)
+        (self.config_dir / "configuration.yaml").write_text("homeassistant:\n")
+        (self.config_dir / ".storage" / "core.config_entries").write_text("{}")
+
+        self.cache_dir = Path(self.temp_dir) / "cache"
+        patcher = mock.patch(
+            "tools.ha_config_validator._RESULT_CACHE_DIR", self.cache_dir
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # Stand in for check_config, counting how often it really runs
+        self.check_runs = 0
+
+        def fake_check(validator):
+            self.check_runs += 1
+            validator.warnings.append("HA Check: light: deprecated option")
+            return True
+
+        patcher = mock.patch.object(
+            HAConfigValidator, "run_ha_check_config", autospec=True
+        )
+        patcher.start().side_effect = fake_check
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def validate(self, use_cache: bool = True) -> HAConfigValidator:
+        """Run a fresh validator that sees a fixed Home Assistant version."""
+        validator = HAConfigValidator(str(self.config_dir))
+        validator._ha_available = True
+        validator._ha_version = "2024.1.0"
+        self.assertTrue(validator.validate_all(use_cache=use_cache))
+        return validator
+
+    def test_unchanged_config_uses_cached_result(self):
+        """Test that an unchanged tree reuses the previous run's messages."""
+        first = self.validate()
+        second = self.validate()
+
+        self.assertEqual(self.check_runs, 1)
+        self.assertEqual(second.warnings, first.warnings)
+        self.assertEqual(second.warnings, ["HA Check: light: deprecated option"])
+
+    def test_edited_yaml_file_invalidates_cache(self):
+        """Test that editing a YAML file runs the check again."""
+        self.validate()
+        (self.config_dir / "configuration.yaml").write_text(
+            "homeassistant:\n  name: Home\n"
+        )
+        self.validate()
+
+        self.assertEqual(self.check_runs, 2)
+
+    def test_edited_non_yaml_file_invalidates_cache(self):
+        """Test that editing a file check_config reads besides YAML runs it again."""
+        self.validate()
+        (self.config_dir / ".storage" / "core.config_entries").write_text(
+            '{"data": {}}'
+        )
+        self.validate()
+
+        self.assertEqual(self.check_runs, 2)
+
+    def test_edits_keep_one_cache_entry(self):
+        """Test that each run for a config directory replaces its one entry."""
+        # Names of different lengths, so each edit changes the file size
+        for name in ("Home", "House", "Apartment"):
+            (self.config_dir / "configuration.yaml").write_text(
+                f"homeassistant:\n  name: {name}\n"
+            )
+            self.validate()
+
+        self.assertEqual(self.check_runs, 3)
+        self.assertEqual(len(list(self.cache_dir.iterdir())), 1)
+
+    def test_malformed_cache_entry_is_a_miss(self):
+        """Test that unreadable or wrongly shaped cache entries are ignored."""
+        self.validate()
+        (cache_file,) = self.cache_dir.iterdir()
+        entry = json.loads(cache_file.read_text())
+
+        for payload in (
+            "",
+            '{"fingerprint": ',
+            "[]",
+            '"text"',
+            json.dumps({**entry, "errors": None}),
+            json.dumps({**entry, "warnings": [1]}),
+            json.dumps({**entry, "valid": "yes"}),
+            json.dumps({key: value for key, value in entry.items() if key != "info"}),
+        ):
+            with self.subTest(payload=payload):
+                cache_file.write_text(payload)
+                runs = self.check_runs
+                validator = self.validate()
+                self.assertEqual(self.check_runs, runs + 1)
+                self.assertEqual(
+                    validator.warnings, ["HA Check: light: deprecated option"]
+                )
+
+    def test_failed_cache_write_leaves_no_partial_file(self):
+        """Test that a failed replace leaves neither an entry nor a temp file."""
+        with mock.patch("os.replace", side_effect=OSError("read-only")):
+            self.validate()
+
+        self.assertEqual(list(self.cache_dir.iterdir()), [])
+        self.validate()
+        self.assertEqual(self.check_runs, 2)
+
+    def test_no_cache_always_runs_check(self):
+        """Test that use_cache=False neither reads nor depends on the cache."""
+        self.validate()
+        validator = self.validate(use_cache=False)
+
+        self.assertEqual(self.check_runs, 2)
+        self.assertEqual(validator.warnings, ["HA Check: light: deprecated option"])
+
+    def test_no_cache_command_line_flag(self):
+        """Test that --no-cache on the command line disables the cache."""
+        from tools import ha_config_validator
+
+        self.validate()
+        argv = ["ha_config_validator.py", "--no-cache", str(self.config_dir)]
+        with mock.patch.object(
+            HAConfigValidator, "check_ha_installation", return_value=True
+        ):
+            with mock.patch("sys.argv", argv), mock.patch("sys.stdout"):
+                with self.assertRaises(SystemExit) as cm:
+                    ha_config_validator.main()
+
+        self.assertEqual(cm.exception.code, 0)
+        self.assertEqual(self.check_runs, 2)
+
+
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -10,8 +10,24 @@ import argparse
 import json
 import sys
 from collections import defaultdict
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
+
+try:
+    # Installed alongside Home Assistant; much faster than the stdlib parser
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _read_json(path: Path) -> Any:
+    """Parse a JSON file, using orjson when it is available."""
+    raw = path.read_bytes()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
 
 
 def load_entity_registry(config_path: Path) -> Optional[Dict]:
@@ -23,8 +39,7 @@ def load_entity_registry(config_path: Path) -> Optional[Dict]:
         return None
 
     try:
-        with open(registry_path, "r") as f:
-            return json.load(f)
+        return _read_json(registry_path)
     except Exception as e:
         print(f"Error reading entity registry: {e}")
         return None
@@ -33,14 +48,15 @@ def load_entity_registry(config_path: Path) -> Optional[Dict]:
 def load_area_registry(config_path: Path) -> Dict[str, str]:
     """Load area names from area registry."""
     area_path = config_path / ".storage" / "core.area_registry"
-    area_names = {}
+    area_names: Dict[str, str] = {}
 
     if area_path.exists():
         try:
-            with open(area_path, "r") as f:
-                area_data = json.load(f)
-                for area in area_data.get("data", {}).get("areas", []):
-                    area_names[area["id"]] = area["name"]
+            area_data = _read_json(area_path)
+            area_names = {
+                area["id"]: area["name"]
+                for area in area_data.get("data", {}).get("areas", ())
+            }
         except Exception as e:
             print(f"Warning: Could not load area names: {e}")
 
@@ -55,17 +71,16 @@ def get_entity_display_name(entity: Dict) -> str:
         return entity["original_name"]
     else:
         # Extract from entity_id
-        return entity["entity_id"].split(".")[-1].replace("_", " ").title()
+        return entity["entity_id"].rpartition(".")[2].replace("_", " ").title()
 
 
-def categorize_entities(entities: List[Dict], area_names: Dict[str, str]) -> Dict:
-    """Categorize entities by domain and area."""
-    by_domain = defaultdict(list)
-    by_area = defaultdict(list)
-    automation_relevant = defaultdict(list)
+# Sort and group keys for entity info dicts
+_ENTITY_ID_KEY = itemgetter("entity_id")
+_DOMAIN_KEY = itemgetter("domain")
 
-    # Domains that are commonly used in automations
-    key_domains = {
+# Domains that are commonly used in automations
+KEY_DOMAINS = frozenset(
+    {
         "climate",
         "switch",
         "light",
@@ -84,96 +99,112 @@ def categorize_entities(entities: List[Dict], area_names: Dict[str, str]) -> Dic
         "input_select",
         "input_number",
     }
+)
 
-    for entity in entities:
-        if entity.get("disabled_by") or entity.get("hidden_by"):
-            continue
 
+def categorize_entities(entities: List[Dict], area_names: Dict[str, str]) -> Dict:
+    """Categorize entities by domain and area."""
+    by_domain = defaultdict(list)
+    by_area = defaultdict(list)
+    automation_relevant = defaultdict(list)
+
+    # Only enabled, visible entities are shown
+    live_entities = [
+        entity
+        for entity in entities
+        if not (entity.get("disabled_by") or entity.get("hidden_by"))
+    ]
+
+    for entity in live_entities:
+        get = entity.get
         entity_id = entity["entity_id"]
-        domain = entity_id.split(".")[0]
-        display_name = get_entity_display_name(entity)
-        area_id = entity.get("area_id")
+        domain = entity_id.partition(".")[0]
+        area_id = get("area_id")
         area_name = area_names.get(area_id, "No Area") if area_id else "No Area"
-        device_class = entity.get("original_device_class") or entity.get("device_class")
+
+        display_name = get_entity_display_name(entity)
+        device_class = get("original_device_class") or get("device_class")
+        unit = get("unit_of_measurement")
+
+        # Detail listing suffix: " (device_class) [unit] | area"
+        detail = ""
+        if device_class:
+            detail += f" ({device_class})"
+        if unit:
+            detail += f" [{unit}]"
+        if area_name != "No Area":
+            detail += f" | {area_name}"
 
         entity_info = {
             "entity_id": entity_id,
+            "domain": domain,
             "name": display_name,
             "area": area_name,
             "device_class": device_class,
-            "platform": entity.get("platform"),
-            "unit": entity.get("unit_of_measurement"),
+            "platform": get("platform"),
+            "unit": unit,
+            "detail": detail,
+            # Lowercased search fields; NUL keeps a match from spanning fields
+            "search_text": f"{entity_id}\0{display_name}\0{device_class or ''}".lower(),
         }
 
         by_domain[domain].append(entity_info)
         by_area[area_name].append(entity_info)
 
         # Categorize automation-relevant entities
-        if domain in key_domains:
+        if domain in KEY_DOMAINS:
             automation_relevant[domain].append(entity_info)
-        elif domain == "sensor" and device_class in [
-            "temperature",
-            "humidity",
-            "motion",
-            "door",
-            "window",
-        ]:
-            automation_relevant["sensor"].append(entity_info)
-        elif domain == "binary_sensor" and device_class in [
-            "motion",
-            "door",
-            "window",
-            "occupancy",
-        ]:
-            automation_relevant["binary_sensor"].append(entity_info)
+
+    # Sort once here so the print functions can list entities in order
+    for group in (by_domain, by_area):
+        for group_entities in group.values():
+            group_entities.sort(key=_ENTITY_ID_KEY)
 
     return {
         "by_domain": dict(by_domain),
         "by_area": dict(by_area),
         "automation_relevant": dict(automation_relevant),
+        "total": len(live_entities),
     }
 
 
 def print_summary(categorized: Dict):
     """Print a summary of available entities."""
-    print("=" * 80)
-    print("HOME ASSISTANT ENTITY REGISTRY SUMMARY")
-    print("=" * 80)
+    # Collect the report and write it in one go
+    lines: List[str] = ["=" * 80, "HOME ASSISTANT ENTITY REGISTRY SUMMARY", "=" * 80]
 
     # Overall stats
-    total_entities = sum(
-        len(entities) for entities in categorized["by_domain"].values()
-    )
+    total_entities = categorized["total"]
     total_domains = len(categorized["by_domain"])
     total_areas = len(categorized["by_area"])
 
-    print("\n📊 OVERVIEW:")
-    print(f"   Total Entities: {total_entities}")
-    print(f"   Domains: {total_domains}")
-    print(f"   Areas: {total_areas}")
+    lines.append("\n📊 OVERVIEW:")
+    lines.append(f"   Total Entities: {total_entities}")
+    lines.append(f"   Domains: {total_domains}")
+    lines.append(f"   Areas: {total_areas}")
 
     # Automation-relevant entities
-    print("\n🤖 AUTOMATION-RELEVANT ENTITIES:")
+    lines.append("\n🤖 AUTOMATION-RELEVANT ENTITIES:")
     for domain in sorted(categorized["automation_relevant"].keys()):
         entities = categorized["automation_relevant"][domain]
-        print(f"   {domain.upper()}: {len(entities)} entities")
+        lines.append(f"   {domain.upper()}: {len(entities)} entities")
 
         # Show a few examples
         for entity in entities[:3]:
             area_str = f" ({entity['area']})" if entity["area"] != "No Area" else ""
             unit_str = f" [{entity['unit']}]" if entity.get("unit") else ""
-            print(f"     • {entity['entity_id']}{area_str}{unit_str}")
+            lines.append(f"     • {entity['entity_id']}{area_str}{unit_str}")
 
         if len(entities) > 3:
-            print(f"     ... and {len(entities) - 3} more")
-        print()
+            lines.append(f"     ... and {len(entities) - 3} more")
+        lines.append("")
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def print_detailed_by_domain(categorized: Dict, domain_filter: Optional[str] = None):
     """Print detailed breakdown by domain."""
-    print("\n" + "=" * 80)
-    print("ENTITIES BY DOMAIN")
-    print("=" * 80)
+    lines: List[str] = ["\n" + "=" * 80, "ENTITIES BY DOMAIN", "=" * 80]
 
     domains_to_show = (
         [domain_filter] if domain_filter else sorted(categorized["by_domain"].keys())
@@ -181,27 +212,20 @@ def print_detailed_by_domain(categorized: Dict, domain_filter: Optional[str] = N
 
     for domain in domains_to_show:
         if domain not in categorized["by_domain"]:
-            print(f"Domain '{domain}' not found")
+            lines.append(f"Domain '{domain}' not found")
             continue
 
         entities = categorized["by_domain"][domain]
-        print(f"\n🏷️  {domain.upper()} ({len(entities)} entities):")
+        lines.append(f"\n🏷️  {domain.upper()} ({len(entities)} entities):")
 
-        for entity in sorted(entities, key=lambda x: x["entity_id"]):
-            area_str = f" | {entity['area']}" if entity["area"] != "No Area" else ""
-            unit_str = f" [{entity['unit']}]" if entity.get("unit") else ""
-            device_class_str = (
-                f" ({entity['device_class']})" if entity.get("device_class") else ""
-            )
+        lines.extend(f"   {e['entity_id']}{e['detail']}" for e in entities)
 
-            print(f"   {entity['entity_id']}{device_class_str}" f"{unit_str}{area_str}")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def print_by_area(categorized: Dict, area_filter: Optional[str] = None):
     """Print entities organized by area."""
-    print("\n" + "=" * 80)
-    print("ENTITIES BY AREA")
-    print("=" * 80)
+    lines: List[str] = ["\n" + "=" * 80, "ENTITIES BY AREA", "=" * 80]
 
     areas_to_show = (
         [area_filter] if area_filter else sorted(categorized["by_area"].keys())
@@ -209,25 +233,19 @@ def print_by_area(categorized: Dict, area_filter: Optional[str] = None):
 
     for area in areas_to_show:
         if area not in categorized["by_area"]:
-            print(f"Area '{area}' not found")
+            lines.append(f"Area '{area}' not found")
             continue
 
         entities = categorized["by_area"][area]
-        print(f"\n🏠 {area.upper()} ({len(entities)} entities):")
+        lines.append(f"\n🏠 {area.upper()} ({len(entities)} entities):")
 
-        # Group by domain within area
-        by_domain_in_area = defaultdict(list)
-        for entity in entities:
-            domain = entity["entity_id"].split(".")[0]
-            by_domain_in_area[domain].append(entity)
+        # Group by domain within area; sorting by entity_id already keeps
+        # each domain contiguous and the domains in order
+        for domain, domain_entities in groupby(entities, key=_DOMAIN_KEY):
+            entity_ids = ", ".join(e["entity_id"] for e in domain_entities)
+            lines.append(f"   {domain}: {entity_ids}")
 
-        for domain in sorted(by_domain_in_area.keys()):
-            domain_entities = by_domain_in_area[domain]
-            entity_ids = ", ".join(
-                e["entity_id"]
-                for e in sorted(domain_entities, key=lambda x: x["entity_id"])
-            )
-            print(f"   {domain}: {entity_ids}")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def search_entities(categorized: Dict, query: str):
@@ -240,28 +258,16 @@ def search_entities(categorized: Dict, query: str):
 
     for domain_entities in categorized["by_domain"].values():
         for entity in domain_entities:
-            if (
-                query_lower in entity["entity_id"].lower()
-                or query_lower in entity["name"].lower()
-                or (
-                    entity.get("device_class")
-                    and query_lower in entity["device_class"].lower()
-                )
-            ):
+            if query_lower in entity["search_text"]:
                 matches.append(entity)
 
     if not matches:
         print("No matches found")
         return
 
-    for entity in sorted(matches, key=lambda x: x["entity_id"]):
-        area_str = f" | {entity['area']}" if entity["area"] != "No Area" else ""
-        unit_str = f" [{entity['unit']}]" if entity.get("unit") else ""
-        device_class_str = (
-            f" ({entity['device_class']})" if entity.get("device_class") else ""
-        )
-
-        print(f"   {entity['entity_id']}{device_class_str}" f"{unit_str}{area_str}")
+    # Matches arrive as already sorted runs per domain, so this is cheap
+    matches.sort(key=_ENTITY_ID_KEY)
+    sys.stdout.write("".join(f"   {e['entity_id']}{e['detail']}\n" for e in matches))
 
 
 def main():
@@ -0,0 +1,71 @@
+"""Run Home Assistant's check_config in the current interpreter.
+
+Shared by the validators that can skip starting a separate hass process
+when the homeassistant package is importable.
+"""
+
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+
+class CheckResult(NamedTuple):
+    """Messages reported by check_config, and whether the config loaded."""
+
+    valid: bool
+    errors: List[str]
+    warnings: List[str]
+
+
+def _messages(found: Dict[str, List[Any]]) -> List[str]:
+    """Render check_config's findings as "HA Check: <domain>: <message>"."""
+    # Each domain lists message strings, each followed by the offending
+    # config when there is one; only the messages are reported
+    return [
+        f"HA Check: {domain}: {item}"
+        for domain, items in found.items()
+        for item in items
+        if isinstance(item, str)
+    ]
+
+
+def check_config_in_process(config_dir: Path, timeout: float) -> Optional[CheckResult]:
+    """Check config_dir with check_config; None if HA is not importable.
+
+    Raises TimeoutError if the check takes longer than timeout seconds.
+    """
+    try:
+        from homeassistant.scripts import check_config
+    except ImportError:
+        return None
+
+    outcome: Dict[str, Any] = {}
+
+    def run():
+        try:
+            # check() takes the config directory itself, unlike the script's
+            # run(), which parses sys.argv
+            outcome["result"] = check_config.check(str(config_dir))
+        except BaseException as e:
+            outcome["error"] = e
+
+    # A daemon thread, so a check that hangs past the timeout cannot keep
+    # the process alive
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise TimeoutError(f"check_config did not finish within {timeout} seconds")
+
+    error = outcome.get("error")
+    if isinstance(error, Exception):
+        raise error
+    if error is not None:
+        # SystemExit and the like must not end the calling validator
+        raise RuntimeError(f"check_config exited: {error!r}") from error
+
+    res = outcome["result"]
+    # Not every Home Assistant release reports a "warn" key
+    warnings = res.get("warn", {})
+    # Like the script's exit code: valid unless something failed to load
+    return CheckResult(not res["except"], _messages(res["except"]), _messages(warnings))
@@ -5,67 +5,80 @@ This script performs deep validation using Home Assistant's own
 configuration checking.
 """
 
+import hashlib
+import importlib.util
+import json
+import os
+import re
 import subprocess
 import sys
+import tempfile
+from importlib import metadata
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 
+try:
+    # Imported as part of the tools package
+    from .ha_check import check_config_in_process
+except ImportError:
+    # Run as a script from the tools directory
+    from ha_check import check_config_in_process
 
-class HAYamlLoader(yaml.SafeLoader):
+# Prefer the libyaml-backed parser; fall back to pure Python if unavailable
+_BaseLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+class HAYamlLoader(_BaseLoader):
     """Custom YAML loader that handles Home Assistant specific tags."""
 
     pass
 
 
-def include_constructor(loader, node):
-    """Handle !include tag."""
-    filename = loader.construct_scalar(node)
-    return f"!include {filename}"
+# Home Assistant tags whose scalar is kept as "<tag> <value>" instead of resolved
+_HA_TAGS = (
+    "!include",
+    "!include_dir_merge_named",
+    "!include_dir_merge_list",
+    "!include_dir_list",
+    "!input",
+    "!secret",
+)
 
 
-def include_dir_merge_named_constructor(loader, node):
-    """Handle !include_dir_merge_named tag."""
-    dirname = loader.construct_scalar(node)
-    return f"!include_dir_merge_named {dirname}"
+def ha_tag_constructor(loader, node):
+    """Keep a Home Assistant tag and its scalar value as a plain string."""
+    if isinstance(node, yaml.ScalarNode):
+        return f"{node.tag} {node.value}"
+    # Let PyYAML raise its usual error for non-scalar values
+    return f"{node.tag} {loader.construct_scalar(node)}"
 
 
-def include_dir_merge_list_constructor(loader, node):
-    """Handle !include_dir_merge_list tag."""
-    dirname = loader.construct_scalar(node)
-    return f"!include_dir_merge_list {dirname}"
+# Register one shared constructor for every Home Assistant tag
+for _tag in _HA_TAGS:
+    HAYamlLoader.add_constructor(_tag, ha_tag_constructor)
 
 
-def include_dir_list_constructor(loader, node):
-    """Handle !include_dir_list tag."""
-    dirname = loader.construct_scalar(node)
-    return f"!include_dir_list {dirname}"
+# Top-level keys that no longer need to be in configuration.yaml
+_DEPRECATED_KEYS = frozenset({"discovery", "introduction", "cloud"})
 
+# check_config results, one JSON file per config directory holding the result
+# for the fingerprint the directory was last checked at
+_RESULT_CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    / "ha_config_validator"
+)
 
-def input_constructor(loader, node):
-    """Handle !input tag for blueprints."""
-    input_name = loader.construct_scalar(node)
-    return f"!input {input_name}"
+# Message lists stored in a cached result
+_CACHED_MESSAGE_KEYS = ("errors", "warnings", "info")
 
+# Integrations whose configuration check_integration_configs inspects
+_CHECKED_INTEGRATIONS = frozenset({"logger", "recorder", "http"})
 
-def secret_constructor(loader, node):
-    """Handle !secret tag."""
-    secret_name = loader.construct_scalar(node)
-    return f"!secret {secret_name}"
 
-
-# Register custom constructors
-HAYamlLoader.add_constructor("!include", include_constructor)
-HAYamlLoader.add_constructor(
-    "!include_dir_merge_named", include_dir_merge_named_constructor
-)
-HAYamlLoader.add_constructor(
-    "!include_dir_merge_list", include_dir_merge_list_constructor
-)
-HAYamlLoader.add_constructor("!include_dir_list", include_dir_list_constructor)
-HAYamlLoader.add_constructor("!input", input_constructor)
-HAYamlLoader.add_constructor("!secret", secret_constructor)
+# stderr lines that are progress chatter rather than errors
+_CHECK_STDERR_SKIP_RE = re.compile(r"debug|info|starting", re.IGNORECASE | re.ASCII)
 
 
 class HAConfigValidator:
@@ -78,8 +91,49 @@ class HAConfigValidator:
         self.warnings: List[str] = []
         self.info: List[str] = []
 
+        # Parsed YAML by path, tagged with the (mtime_ns, size) it was read at
+        self._yaml_cache: Dict[Path, Tuple[Tuple[int, int], Any]] = {}
+
+        # Result of check_ha_installation, probed once per validator, and the
+        # version string it found
+        self._ha_available: Optional[bool] = None
+        self._ha_version: Optional[str] = None
+
+        # Cleared when a check fails transiently (e.g. times out), so that
+        # its result is not cached
+        self._result_cacheable = True
+
+    def _load_yaml(self, path: Path) -> Any:
+        """Load a YAML file, reusing the parsed result while it is unchanged."""
+        stat = path.stat()
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._yaml_cache.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        with open(path, "r") as f:
+            data = yaml.load(f, Loader=HAYamlLoader)
+        self._yaml_cache[path] = (key, data)
+        return data
+
     def check_ha_installation(self) -> bool:
         """Check if Home Assistant is available for configuration checking."""
+        if self._ha_available is None:
+            self._ha_available = self._probe_ha_installation()
+        return self._ha_available
+
+    def _probe_ha_installation(self) -> bool:
+        """Look for Home Assistant, in this interpreter first, then on PATH."""
+        # An importable package needs no extra interpreter to find its version
+        if importlib.util.find_spec("homeassistant") is not None:
+            try:
+                version = metadata.version("homeassistant")
+            except metadata.PackageNotFoundError:
+                version = "unknown version"
+            self._ha_version = version
+            self.info.append(f"Using Home Assistant: {version}")
+            return True
+
         try:
             # Try to run hass --version
             result = subprocess.run(
@@ -89,7 +143,8 @@ class HAConfigValidator:
                 timeout=10,
             )
             if result.returncode == 0:
-                self.info.append(f"Using Home Assistant: {result.stdout.strip()}")
+                self._ha_version = result.stdout.strip()
+                self.info.append(f"Using Home Assistant: {self._ha_version}")
                 return True
         except (subprocess.TimeoutExpired, FileNotFoundError):
             pass
@@ -103,7 +158,8 @@ class HAConfigValidator:
                 timeout=10,
             )
             if result.returncode == 0:
-                self.info.append(f"Using Home Assistant: {result.stdout.strip()}")
+                self._ha_version = result.stdout.strip()
+                self.info.append(f"Using Home Assistant: {self._ha_version}")
                 return True
         except (subprocess.TimeoutExpired, FileNotFoundError):
             pass
@@ -118,6 +174,11 @@ class HAConfigValidator:
         if not self.check_ha_installation():
             return self.run_basic_validation()
 
+        # Importable Home Assistant runs the same check without a new process
+        in_process_result = self.run_check_config_in_process()
+        if in_process_result is not None:
+            return in_process_result
+
         try:
             # First try the hass command
             cmd = [
@@ -152,48 +213,65 @@ class HAConfigValidator:
             return result.returncode == 0
 
         except subprocess.TimeoutExpired:
+            self._result_cacheable = False
+            self.errors.append("Home Assistant configuration check timed out")
+            return False
+        except Exception as e:
+            self._result_cacheable = False
+            self.errors.append(f"Failed to run HA config check: {e}")
+            return self.run_basic_validation()
+
+    def run_check_config_in_process(self) -> Optional[bool]:
+        """Run check_config in this interpreter; None if it is not importable."""
+        try:
+            result = check_config_in_process(self.config_dir, timeout=60)
+        except TimeoutError:
+            self._result_cacheable = False
             self.errors.append("Home Assistant configuration check timed out")
             return False
         except Exception as e:
+            self._result_cacheable = False
             self.errors.append(f"Failed to run HA config check: {e}")
             return self.run_basic_validation()
 
+        if result is None:
+            return None
+        self.errors.extend(result.errors)
+        self.warnings.extend(result.warnings)
+        return result.valid
+
     def parse_check_config_output(self, output: str):
         """Parse Home Assistant check_config output."""
-        lines = output.split("\n")
-
-        for line in lines:
+        for line in output.split("\n"):
             line = line.strip()
             if not line:
                 continue
 
             # Look for common patterns
+            lower = line.lower()
             if line.startswith("ERROR"):
                 self.errors.append(f"HA Check: {line}")
             elif line.startswith("WARNING"):
                 self.warnings.append(f"HA Check: {line}")
-            elif "successful" in line.lower():
+            elif "successful" in lower:
                 self.info.append(f"HA Check: {line}")
-            elif "error" in line.lower():
+            elif "error" in lower:
                 self.errors.append(f"HA Check: {line}")
-            elif "warning" in line.lower():
+            elif "warning" in lower:
                 self.warnings.append(f"HA Check: {line}")
 
     def parse_check_config_errors(self, stderr: str):
         """Parse Home Assistant check_config error output."""
-        lines = stderr.split("\n")
-
-        for line in lines:
+        for line in stderr.split("\n"):
             line = line.strip()
             if not line:
                 continue
 
             # Filter out common non-error messages
-            if any(x in line.lower() for x in ["debug", "info", "starting"]):
+            if _CHECK_STDERR_SKIP_RE.search(line):
                 continue
 
-            if line:
-                self.errors.append(f"HA Error: {line}")
+            self.errors.append(f"HA Error: {line}")
 
     def run_basic_validation(self) -> bool:
         """Run basic configuration validation without HA."""
@@ -207,8 +285,7 @@ class HAConfigValidator:
 
         # Validate configuration.yaml syntax and basic structure
         try:
-            with open(config_file, "r") as f:
-                config = yaml.safe_load(f)
+            config = self._load_yaml(config_file)
 
             if not isinstance(config, dict):
                 self.errors.append("configuration.yaml must contain a dictionary")
@@ -252,22 +329,24 @@ class HAConfigValidator:
                 if "time_zone" not in ha_config:
                     self.warnings.append("Missing time_zone in homeassistant section")
 
-        # Check for deprecated keys
-        deprecated_keys = ["discovery", "introduction", "cloud"]
-        for key in deprecated_keys:
-            if key in config:
-                if key == "cloud":
-                    self.warnings.append(f"'{key}' configuration should be done via UI")
-                else:
-                    self.warnings.append(f"'{key}' is deprecated and can be removed")
+        # Check for deprecated keys, in a stable order
+        for key in sorted(_DEPRECATED_KEYS & config.keys()):
+            if key == "cloud":
+                self.warnings.append(f"'{key}' configuration should be done via UI")
+            else:
+                self.warnings.append(f"'{key}' is deprecated and can be removed")
 
         # Check for common integration configurations
         self.check_integration_configs(config)
 
     def check_integration_configs(self, config: Dict[str, Any]):
         """Check common integration configurations."""
+        present = _CHECKED_INTEGRATIONS.intersection(config)
+        if not present:
+            return
+
         # Check logger configuration
-        if "logger" in config:
+        if "logger" in present:
             logger_config = config["logger"]
             if isinstance(logger_config, dict):
                 if "logs" in logger_config and not isinstance(
@@ -276,7 +355,7 @@ class HAConfigValidator:
                     self.errors.append("logger.logs must be a dictionary")
 
         # Check recorder configuration
-        if "recorder" in config:
+        if "recorder" in present:
             recorder_config = config["recorder"]
             if isinstance(recorder_config, dict):
                 if "db_url" in recorder_config:
@@ -287,7 +366,7 @@ class HAConfigValidator:
                         self.warnings.append("recorder.db_url format may be invalid")
 
         # Check HTTP configuration
-        if "http" in config:
+        if "http" in present:
             http_config = config["http"]
             if isinstance(http_config, dict):
                 if "ssl_certificate" in http_config or "ssl_key" in http_config:
@@ -307,8 +386,7 @@ class HAConfigValidator:
             return
 
         try:
-            with open(automations_file, "r") as f:
-                automations = yaml.safe_load(f)
+            automations = self._load_yaml(automations_file)
 
             if automations is not None and not isinstance(automations, list):
                 self.errors.append("automations.yaml must contain a list")
@@ -338,8 +416,7 @@ class HAConfigValidator:
             return
 
         try:
-            with open(scripts_file, "r") as f:
-                scripts = yaml.safe_load(f)
+            scripts = self._load_yaml(scripts_file)
 
             if scripts is not None and not isinstance(scripts, dict):
                 self.errors.append("scripts.yaml must contain a dictionary")
@@ -371,8 +448,7 @@ class HAConfigValidator:
             return
 
         try:
-            with open(secrets_file, "r") as f:
-                secrets = yaml.safe_load(f)
+            secrets = self._load_yaml(secrets_file)
 
             if secrets is not None and not isinstance(secrets, dict):
                 self.errors.append("secrets.yaml must contain a dictionary")
@@ -384,49 +460,140 @@ class HAConfigValidator:
         except Exception as e:
             self.errors.append(f"Error reading secrets.yaml: {e}")
 
-    def validate_all(self) -> bool:
+    def validate_all(self, use_cache: bool = True) -> bool:
         """Run all validation checks."""
         if not self.config_dir.exists():
             self.errors.append(f"Config directory {self.config_dir} does not exist")
             return False
 
-        # Try HA's built-in validation first
-        return self.run_ha_check_config()
+        # Without HA only the quick basic checks run, which are not cached
+        if not self.check_ha_installation() or not use_cache:
+            return self.run_ha_check_config()
+
+        # An unchanged tree checked by the same HA version gives the same result
+        cache_file = self._result_cache_file()
+        fingerprint = self._config_fingerprint()
+        cached = self._read_cached_result(cache_file, fingerprint)
+        if cached is not None:
+            self.errors.extend(cached["errors"])
+            self.warnings.extend(cached["warnings"])
+            self.info.extend(cached["info"])
+            return cached["valid"]
+
+        # Only cache the messages of the check itself, not of the HA probe
+        start = len(self.errors), len(self.warnings), len(self.info)
+        is_valid = self.run_ha_check_config()
+        if self._result_cacheable:
+            result = {
+                "fingerprint": fingerprint,
+                "valid": is_valid,
+                "errors": self.errors[start[0] :],
+                "warnings": self.warnings[start[1] :],
+                "info": self.info[start[2] :],
+            }
+            self._write_cached_result(cache_file, result)
+        return is_valid
+
+    def _result_cache_file(self) -> Path:
+        """Return the result cache entry of this config directory."""
+        name = hashlib.blake2b(str(self.config_dir).encode(), digest_size=16)
+        return _RESULT_CACHE_DIR / f"{name.hexdigest()}.json"
+
+    def _read_cached_result(
+        self, cache_file: Path, fingerprint: str
+    ) -> Optional[Dict[str, Any]]:
+        """Return the cached result if it is for fingerprint, else None."""
+        try:
+            cached = json.loads(cache_file.read_bytes())
+            if cached["fingerprint"] != fingerprint:
+                return None
+            if not isinstance(cached["valid"], bool):
+                return None
+            for key in _CACHED_MESSAGE_KEYS:
+                messages = cached[key]
+                if not isinstance(messages, list) or not all(
+                    isinstance(message, str) for message in messages
+                ):
+                    return None
+        except (OSError, ValueError, KeyError, TypeError):
+            # Missing, truncated or in another format; just check again
+            return None
+        return cached
+
+    def _write_cached_result(self, cache_file: Path, result: Dict[str, Any]):
+        """Replace the cache entry, so readers never see a partial write."""
+        try:
+            _RESULT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=_RESULT_CACHE_DIR, prefix=cache_file.stem, suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(result, f)
+                os.replace(tmp_path, cache_file)
+            except OSError:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            # An unwritable cache only costs the next run a check
+            pass
+
+    def _config_fingerprint(self) -> str:
+        """Hash the path, size and mtime of every config file plus the HA version."""
+        # Not only YAML: check_config also reads .storage, custom components
+        # and included JSON, so any changed file must give a new fingerprint
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{self.config_dir}\0{self._ha_version}\0".encode())
+        for dirpath, dirnames, filenames in os.walk(self.config_dir):
+            # Walk in a fixed order so the same tree always hashes the same
+            dirnames.sort()
+            for filename in sorted(filenames):
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                digest.update(f"{path}\0{stat.st_size}\0{stat.st_mtime_ns}\0".encode())
+        return digest.hexdigest()
 
     def print_results(self):
         """Print validation results."""
+        # Collect the report and write it in one go
+        lines: List[str] = []
         if self.info:
-            print("INFO:")
-            for info in self.info:
-                print(f"  ℹ️  {info}")
-            print()
+            lines.append("INFO:")
+            lines.extend(f"  ℹ️  {info}" for info in self.info)
+            lines.append("")
 
         if self.errors:
-            print("ERRORS:")
-            for error in self.errors:
-                print(f"  ❌ {error}")
-            print()
+            lines.append("ERRORS:")
+            lines.extend(f"  ❌ {error}" for error in self.errors)
+            lines.append("")
 
         if self.warnings:
-            print("WARNINGS:")
-            for warning in self.warnings:
-                print(f"  ⚠️  {warning}")
-            print()
+            lines.append("WARNINGS:")
+            lines.extend(f"  ⚠️  {warning}" for warning in self.warnings)
+            lines.append("")
 
         if not self.errors and not self.warnings:
-            print("✅ Home Assistant configuration is valid!")
+            lines.append("✅ Home Assistant configuration is valid!")
         elif not self.errors:
-            print("✅ Home Assistant configuration is valid (with warnings)")
+            lines.append("✅ Home Assistant configuration is valid (with warnings)")
         else:
-            print("❌ Home Assistant configuration validation failed")
+            lines.append("❌ Home Assistant configuration validation failed")
+
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 def main():
     """Run main function for command line usage."""
-    config_dir = sys.argv[1] if len(sys.argv) > 1 else "config"
+    args = sys.argv[1:]
+    use_cache = "--no-cache" not in args
+    args = [arg for arg in args if arg != "--no-cache"]
+    config_dir = args[0] if args else "config"
 
     validator = HAConfigValidator(config_dir)
-    is_valid = validator.validate_all()
+    is_valid = validator.validate_all(use_cache=use_cache)
     validator.print_results()
 
     sys.exit(0 if is_valid else 1)
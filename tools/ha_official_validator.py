@@ -5,10 +5,28 @@ This leverages Home Assistant's own validation tools for the most
 accurate results.
 """
 
+import re
 import subprocess
 import sys
 from pathlib import Path
-from typing import List
+from typing import List, Optional
+
+try:
+    # Imported as part of the tools package
+    from .ha_check import check_config_in_process
+except ImportError:
+    # Run as a script from the tools directory
+    from ha_check import check_config_in_process
+
+# Seconds the configuration check may take, in process or as a subprocess
+_CHECK_TIMEOUT = 120
+
+# stderr lines that are debug output or progress chatter rather than errors
+_STDERR_SKIP_RE = re.compile(
+    r"debug|info:|starting|voluptuous|setup of domain|setup of platform"
+    r"|loading|initialized",
+    re.IGNORECASE | re.ASCII,
+)
 
 
 class HAOfficialValidator:
@@ -23,6 +41,11 @@ class HAOfficialValidator:
 
     def run_ha_check_config(self) -> bool:
         """Run Home Assistant's official check_config script."""
+        # Importable Home Assistant runs the same check without a new process
+        in_process_result = self.run_check_config_in_process()
+        if in_process_result is not None:
+            return in_process_result
+
         try:
             # Use the hass command to check configuration
             cmd = [
@@ -40,7 +63,7 @@ class HAOfficialValidator:
                 cmd,
                 capture_output=True,
                 text=True,
-                timeout=120,
+                timeout=_CHECK_TIMEOUT,
                 cwd=str(self.config_dir),
             )
 
@@ -63,23 +86,41 @@ class HAOfficialValidator:
             self.errors.append(f"Failed to run Home Assistant config check: {e}")
             return False
 
+    def run_check_config_in_process(self) -> Optional[bool]:
+        """Run check_config in this interpreter; None if it is not importable."""
+        try:
+            result = check_config_in_process(self.config_dir, _CHECK_TIMEOUT)
+        except TimeoutError:
+            self.errors.append("Home Assistant configuration check timed out")
+            return False
+        except Exception as e:
+            self.errors.append(f"Failed to run Home Assistant config check: {e}")
+            return False
+
+        if result is None:
+            return None
+        self.errors.extend(result.errors)
+        self.warnings.extend(result.warnings)
+        return result.valid
+
     def parse_check_config_output(self, stdout: str, stderr: str):
         """Parse Home Assistant check_config output."""
         # Parse stdout
         if stdout:
-            lines = stdout.split("\n")
-            for line in lines:
+            for line in stdout.split("\n"):
                 line = line.strip()
                 if not line:
                     continue
 
                 # Look for specific patterns
-                if "Testing configuration at" in line:
-                    self.info.append(f"HA Check: {line}")
-                elif "Configuration check successful!" in line:
+                lower = line.lower()
+                if (
+                    "Testing configuration at" in line
+                    or "Configuration check successful!" in line
+                ):
                     self.info.append(f"HA Check: {line}")
-                elif "errors" in line.lower() and "found" in line.lower():
-                    if "0 errors" in line.lower():
+                elif "errors" in lower and "found" in lower:
+                    if "0 errors" in lower:
                         self.info.append(f"HA Check: {line}")
                     else:
                         self.errors.append(f"HA Check: {line}")
@@ -87,34 +128,19 @@ class HAOfficialValidator:
                     self.errors.append(f"HA Check: {line}")
                 elif "WARNING" in line or "Warning" in line:
                     self.warnings.append(f"HA Check: {line}")
-                else:
+                elif not line.startswith("INFO:"):
                     # Include other informational lines
-                    if line and not line.startswith("INFO:"):
-                        self.info.append(f"HA Check: {line}")
+                    self.info.append(f"HA Check: {line}")
 
         # Parse stderr for actual errors
         if stderr:
-            lines = stderr.split("\n")
-            for line in lines:
+            for line in stderr.split("\n"):
                 line = line.strip()
                 if not line:
                     continue
 
-                # Filter out debug/info messages
-                if any(x in line.lower() for x in ["debug", "info:", "starting"]):
-                    continue
-
-                # Skip common non-error messages
-                if any(
-                    x in line.lower()
-                    for x in [
-                        "voluptuous",
-                        "setup of domain",
-                        "setup of platform",
-                        "loading",
-                        "initialized",
-                    ]
-                ):
+                # Filter out debug/info and other common non-error messages
+                if _STDERR_SKIP_RE.search(line):
                     continue
 
                 # This is likely an actual error
@@ -4,14 +4,71 @@
 Validates that all entity references in configuration files actually exist.
 """
 
+import functools
 import json
+import os
 import re
 import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, TypedDict
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    TypedDict,
+)
 
 import yaml
 
+try:
+    # Installed alongside Home Assistant; much faster than the stdlib parser
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Below this many files, starting worker processes costs more than it saves
+_PARALLEL_MIN_FILES = 8
+
+# A file containing none of these cannot hold references, so its parsed data
+# is not walked; they cover the reference keys below and the template calls
+_REFERENCE_TOKENS = (
+    b"entity_id",
+    b"entities",
+    b"device_id",
+    b"area_id",
+    b"states(",
+    b"is_state(",
+    b"state_attr(",
+)
+
+# Keys whose values are entity, device and area references
+_ENTITY_KEYS = frozenset({"entity_id", "entity_ids", "entities"})
+_DEVICE_KEYS = frozenset({"device_id", "device_ids"})
+_AREA_KEYS = frozenset({"area_id", "area_ids"})
+
+# Template calls that mark a string as worth scanning for entity references;
+# all of them contain "(", which is checked first as a cheaper filter since
+# plain values such as "platform: state" rarely have one
+_TEMPLATE_CALL_RE = re.compile(r"state_attr\(|states\(|is_state\(")
+
+# Entity references in templates, as one alternation so each template is
+# scanned once. The lookahead lets matches overlap, as they could when each
+# pattern was searched separately. Jinja allows spaces inside the call
+# parentheses, so those are accepted too.
+_TEMPLATE_ENTITY_RE = re.compile(
+    r"(?=states\(\s*(?:'([^']+)'|\"([^\"]+)\")\s*\)"  # states('entity.id')
+    r"|states\.([a-zA-Z_][a-zA-Z0-9_]*\.[a-zA-Z_][a-zA-Z0-9_]*)"  # states.domain.entity
+    r"|is_state\(\s*(?:'([^']+)'|\"([^\"]+)\")"  # is_state('entity.id', ...)
+    r"|state_attr\(\s*(?:'([^']+)'|\"([^\"]+)\"))"  # state_attr('entity.id', ...)
+)
+
 
 class DomainSummary(TypedDict):
     """Type definition for domain summary dictionary."""
@@ -22,7 +79,21 @@ class DomainSummary(TypedDict):
     examples: List[str]
 
 
-class HAYamlLoader(yaml.SafeLoader):
+class RegistryIndex(NamedTuple):
+    """The registry IDs that references are checked against."""
+
+    entity_ids: FrozenSet[str]
+    disabled_entity_ids: FrozenSet[str]
+    device_ids: FrozenSet[str]
+    area_ids: FrozenSet[str]
+    registry_id_map: Dict[str, str]
+
+
+# Prefer the libyaml-backed parser; fall back to pure Python if unavailable
+_BaseLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+class HAYamlLoader(_BaseLoader):
     """Custom YAML loader that handles Home Assistant specific tags."""
 
     pass
@@ -77,11 +148,70 @@ HAYamlLoader.add_constructor("!input", input_constructor)
 HAYamlLoader.add_constructor("!secret", secret_constructor)
 
 
+def _parse_json(raw: bytes) -> Any:
+    """Parse JSON bytes, using orjson when it is available."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _read_json(path: Path) -> Any:
+    """Parse a JSON file, using orjson when it is available."""
+    return _parse_json(path.read_bytes())
+
+
+@functools.lru_cache(maxsize=4096)
+def _template_entities(template: str) -> FrozenSet[str]:
+    """Extract entity references from a template, reused for repeated templates."""
+    # Every pattern contains "state"; most strings have no template
+    if "state" not in template:
+        return frozenset()
+
+    entities = set()
+    for match in _TEMPLATE_ENTITY_RE.finditer(template):
+        # Only the alternative that matched has a group value
+        entity_id = match[match.lastindex]
+        # Validate entity ID format
+        if "." in entity_id and len(entity_id.split(".")) == 2:
+            entities.add(entity_id)
+
+    return frozenset(entities)
+
+
+def _load_registry(registry_file: Path, section: str, key: str) -> Dict[str, Any]:
+    """Load a registry's section items by key, shared while the file is unchanged."""
+    # The dict is shared between validators, so it must not be modified
+    stat = registry_file.stat()
+    return _parse_registry(
+        str(registry_file), stat.st_mtime_ns, stat.st_size, section, key
+    )
+
+
+@functools.lru_cache(maxsize=16)
+def _parse_registry(
+    path: str, mtime_ns: int, size: int, section: str, key: str
+) -> Dict[str, Any]:
+    """Parse a registry file; mtime_ns and size key the cache, so edits reparse."""
+    data = _read_json(Path(path))
+    return {item[key]: item for item in data.get("data", {}).get(section, [])}
+
+
+# UUID format: HA registry IDs are 32 lowercase hex characters without hyphens
+_UUID_RE = re.compile(r"\A[a-f0-9]{32}\Z")
+_HEX_DIGITS = b"0123456789abcdef"
+
+# Template expressions like {{ ... }}
+_TEMPLATE_RE = re.compile(r"\{\{.*?\}\}")
+
+# Values that are not plain entity IDs: HA tags, UUIDs and templates
+_SKIP_RE = re.compile(r"\A!|" + _UUID_RE.pattern + "|" + _TEMPLATE_RE.pattern)
+
+
 class ReferenceValidator:
     """Validates entity and device references in Home Assistant config."""
 
     # Special keywords that are not entity IDs
-    SPECIAL_KEYWORDS = {"all", "none"}
+    SPECIAL_KEYWORDS = frozenset({"all", "none"})
 
     def __init__(self, config_dir: str = "config"):
         """Initialize the ReferenceValidator."""
@@ -94,6 +224,12 @@ class ReferenceValidator:
         self._entities: Optional[Dict[str, Any]] = None
         self._devices: Optional[Dict[str, Any]] = None
         self._areas: Optional[Dict[str, Any]] = None
+        self._registry_id_map: Optional[Dict[str, str]] = None
+        # Registry IDs for reference checks, filled in along with the above
+        self._entity_ids: FrozenSet[str] = frozenset()
+        self._disabled_entity_ids: FrozenSet[str] = frozenset()
+        self._device_ids: FrozenSet[str] = frozenset()
+        self._area_ids: FrozenSet[str] = frozenset()
 
     def load_entity_registry(self) -> Dict[str, Any]:
         """Load and cache entity registry."""
@@ -104,12 +240,13 @@ class ReferenceValidator:
                 return {}
 
             try:
-                with open(registry_file, "r") as f:
-                    data = json.load(f)
-                    self._entities = {
-                        entity["entity_id"]: entity
-                        for entity in data.get("data", {}).get("entities", [])
-                    }
+                self._entities = _load_registry(registry_file, "entities", "entity_id")
+                self._entity_ids = frozenset(self._entities)
+                self._disabled_entity_ids = frozenset(
+                    entity_id
+                    for entity_id, entity in self._entities.items()
+                    if entity.get("disabled_by") is not None
+                )
             except Exception as e:
                 self.errors.append(f"Failed to load entity registry: {e}")
                 return {}
@@ -125,12 +262,8 @@ class ReferenceValidator:
                 return {}
 
             try:
-                with open(registry_file, "r") as f:
-                    data = json.load(f)
-                    self._devices = {
-                        device["id"]: device
-                        for device in data.get("data", {}).get("devices", [])
-                    }
+                self._devices = _load_registry(registry_file, "devices", "id")
+                self._device_ids = frozenset(self._devices)
             except Exception as e:
                 self.errors.append(f"Failed to load device registry: {e}")
                 return {}
@@ -146,12 +279,8 @@ class ReferenceValidator:
                 return {}
 
             try:
-                with open(registry_file, "r") as f:
-                    data = json.load(f)
-                    self._areas = {
-                        area["id"]: area
-                        for area in data.get("data", {}).get("areas", [])
-                    }
+                self._areas = _load_registry(registry_file, "areas", "id")
+                self._area_ids = frozenset(self._areas)
             except Exception as e:
                 self.warnings.append(f"Failed to load area registry: {e}")
                 return {}
@@ -161,181 +290,183 @@ class ReferenceValidator:
     def is_uuid_format(self, value: str) -> bool:
         """Check if a string matches UUID format (32 hex characters)."""
         # UUID format: 8-4-4-4-12 hex digits, but HA often stores without hyphens
-        uuid_pattern = r"^[a-f0-9]{32}$"
-        return bool(re.match(uuid_pattern, value))
+        if len(value) != 32:
+            return False
+        # Deleting every hex digit leaves nothing; non-ASCII becomes "?" and stays
+        return not value.encode("ascii", "replace").translate(None, _HEX_DIGITS)
 
     def is_template(self, value: str) -> bool:
         """Check if value is a Jinja2 template expression."""
-        import re
-        # Match template expressions like {{ ... }}
-        return bool(re.search(r'\{\{.*?\}\}', value))
+        return _TEMPLATE_RE.search(value) is not None
 
     def should_skip_entity_validation(self, value: str) -> bool:
         """Check if entity reference should be skipped during validation."""
-        return (
-            value.startswith("!") or  # HA tags like !input, !secret
-            self.is_uuid_format(value) or  # UUID format (device-based)
-            self.is_template(value) or  # Template expressions
-            value in self.SPECIAL_KEYWORDS  # Special keywords like "all", "none"
-        )
+        # Special keywords like "all", "none", then HA tags (!input, !secret),
+        # UUID format (device-based) and templates in a single regex scan
+        return value in self.SPECIAL_KEYWORDS or _SKIP_RE.search(value) is not None
 
-    def extract_entity_references(self, data: Any, path: str = "") -> Set[str]:
+    def extract_entity_references(self, data: Any) -> Set[str]:
         """Extract entity references from configuration data."""
-        entities = set()
+        return self.extract_all_references(data)[0]
+
+    def extract_all_references(
+        self, data: Any
+    ) -> Tuple[Set[str], Set[str], Set[str], Set[str]]:
+        """Extract entity, device, area and entity registry ID references.
+
+        One walk over the data collects all four kinds of reference. Entities
+        are not looked for below entity, device or area keys, devices not below
+        device keys and areas not below area keys; registry IDs are looked for
+        everywhere.
+        """
+        entities: Set[str] = set()
+        devices: Set[str] = set()
+        areas: Set[str] = set()
+        entity_registry_ids: Set[str] = set()
+
+        # Explicit stack of (node, want_entities, want_devices, want_areas),
+        # so deeply nested configs cost no Python frames
+        stack = [(data, True, True, True)]
+        while stack:
+            node, want_entities, want_devices, want_areas = stack.pop()
+
+            if isinstance(node, list):
+                stack.extend(
+                    (item, want_entities, want_devices, want_areas) for item in node
+                )
+                continue
+            if not isinstance(node, dict):
+                continue
 
-        if isinstance(data, dict):
-            for key, value in data.items():
-                current_path = f"{path}.{key}" if path else key
+            for key, value in node.items():
+                # Look for entity_id fields containing UUIDs (device-based automations)
+                if key == "entity_id" and isinstance(value, str):
+                    if self.is_uuid_format(value):
+                        entity_registry_ids.add(value)
 
                 # Common entity reference keys
-                if key in ["entity_id", "entity_ids", "entities"]:
-                    if isinstance(value, str):
-                        if not self.should_skip_entity_validation(value):
-                            entities.add(value)
-                    elif isinstance(value, list):
-                        for entity in value:
-                            if isinstance(entity, str) and not self.should_skip_entity_validation(entity):
-                                entities.add(entity)
+                if key in _ENTITY_KEYS:
+                    if want_entities:
+                        if isinstance(value, str):
+                            if not self.should_skip_entity_validation(value):
+                                entities.add(value)
+                        elif isinstance(value, list):
+                            entities.update(
+                                entity
+                                for entity in value
+                                if isinstance(entity, str)
+                                and not self.should_skip_entity_validation(entity)
+                            )
+                    stack.append((value, False, want_devices, want_areas))
 
                 # Device-related keys
-                elif key in ["device_id", "device_ids"]:
-                    # Device IDs are handled separately
-                    pass
+                elif key in _DEVICE_KEYS:
+                    if want_devices:
+                        # Skip blueprint inputs and other HA tags
+                        if isinstance(value, str):
+                            if not value.startswith("!"):
+                                devices.add(value)
+                        elif isinstance(value, list):
+                            devices.update(
+                                device
+                                for device in value
+                                if isinstance(device, str)
+                                and not device.startswith("!")
+                            )
+                    stack.append((value, False, False, want_areas))
 
                 # Area-related keys
-                elif key in ["area_id", "area_ids"]:
-                    # Area IDs are handled separately
-                    pass
-
-                # Service data might contain entity references
-                elif key == "data" and isinstance(value, dict):
-                    entities.update(self.extract_entity_references(value, current_path))
+                elif key in _AREA_KEYS:
+                    if want_areas:
+                        # Skip blueprint inputs and other HA tags
+                        if isinstance(value, str):
+                            if not value.startswith("!"):
+                                areas.add(value)
+                        elif isinstance(value, list):
+                            areas.update(
+                                area
+                                for area in value
+                                if isinstance(area, str) and not area.startswith("!")
+                            )
+                    stack.append((value, False, want_devices, False))
 
                 # Templates might contain entity references
-                elif isinstance(value, str) and any(
-                    x in value for x in ["state_attr(", "states(", "is_state("]
-                ):
-                    entities.update(self.extract_entities_from_template(value))
+                elif isinstance(value, str):
+                    if (
+                        want_entities
+                        and "(" in value
+                        and _TEMPLATE_CALL_RE.search(value)
+                    ):
+                        entities.update(_template_entities(value))
 
                 # Recursive search
                 else:
-                    entities.update(self.extract_entity_references(value, current_path))
-
-        elif isinstance(data, list):
-            for i, item in enumerate(data):
-                current_path = f"{path}[{i}]" if path else f"[{i}]"
-                entities.update(self.extract_entity_references(item, current_path))
+                    stack.append((value, want_entities, want_devices, want_areas))
 
-        return entities
+        return entities, devices, areas, entity_registry_ids
 
     def extract_entities_from_template(self, template: str) -> Set[str]:
         """Extract entity references from Jinja2 templates."""
-        entities = set()
-
-        # Common patterns for entity references in templates
-        patterns = [
-            r"states\('([^']+)'\)",  # states('entity.id')
-            r'states\("([^"]+)"\)',  # states("entity.id")
-            # states.domain.entity
-            r"states\.([a-zA-Z_][a-zA-Z0-9_]*\.[a-zA-Z_][a-zA-Z0-9_]*)",
-            r"is_state\('([^']+)'",  # is_state('entity.id', ...)
-            r'is_state\("([^"]+)"',  # is_state("entity.id", ...)
-            r"state_attr\('([^']+)'",  # state_attr('entity.id', ...)
-            r'state_attr\("([^"]+)"',  # state_attr("entity.id", ...)
-        ]
-
-        for pattern in patterns:
-            matches = re.findall(pattern, template)
-            for match in matches:
-                # Validate entity ID format
-                if "." in match and len(match.split(".")) == 2:
-                    entities.add(match)
-
-        return entities
+        return set(_template_entities(template))
 
     def extract_device_references(self, data: Any) -> Set[str]:
         """Extract device references from configuration data."""
-        devices = set()
-
-        if isinstance(data, dict):
-            for key, value in data.items():
-                if key in ["device_id", "device_ids"]:
-                    if isinstance(value, str):
-                        # Skip blueprint inputs and other HA tags
-                        if not value.startswith("!"):
-                            devices.add(value)
-                    elif isinstance(value, list):
-                        for device in value:
-                            if isinstance(device, str) and not device.startswith("!"):
-                                devices.add(device)
-                else:
-                    devices.update(self.extract_device_references(value))
-
-        elif isinstance(data, list):
-            for item in data:
-                devices.update(self.extract_device_references(item))
-
-        return devices
+        return self.extract_all_references(data)[1]
 
     def extract_area_references(self, data: Any) -> Set[str]:
         """Extract area references from configuration data."""
-        areas = set()
-
-        if isinstance(data, dict):
-            for key, value in data.items():
-                if key in ["area_id", "area_ids"]:
-                    if isinstance(value, str):
-                        # Skip blueprint inputs and other HA tags
-                        if not value.startswith("!"):
-                            areas.add(value)
-                    elif isinstance(value, list):
-                        for area in value:
-                            if isinstance(area, str) and not area.startswith("!"):
-                                areas.add(area)
-                else:
-                    areas.update(self.extract_area_references(value))
-
-        elif isinstance(data, list):
-            for item in data:
-                areas.update(self.extract_area_references(item))
-
-        return areas
+        return self.extract_all_references(data)[2]
 
     def extract_entity_registry_ids(self, data: Any) -> Set[str]:
         """Extract entity registry UUID references from configuration data."""
-        entity_registry_ids = set()
-
-        if isinstance(data, dict):
-            for key, value in data.items():
-                # Look for entity_id fields containing UUIDs (device-based automations)
-                if key == "entity_id" and isinstance(value, str):
-                    if self.is_uuid_format(value):
-                        entity_registry_ids.add(value)
-                else:
-                    entity_registry_ids.update(self.extract_entity_registry_ids(value))
-        elif isinstance(data, list):
-            for item in data:
-                entity_registry_ids.update(self.extract_entity_registry_ids(item))
-
-        return entity_registry_ids
+        return self.extract_all_references(data)[3]
 
     def get_entity_registry_id_mapping(self) -> Dict[str, str]:
         """Get mapping from entity registry ID to entity_id."""
+        return self._map_registry_ids(self.load_entity_registry())
+
+    def _map_registry_ids(self, entities: Dict[str, Any]) -> Dict[str, str]:
+        """Map registry IDs to entity IDs for the already loaded entities."""
+        if self._registry_id_map is None:
+            mapping = {
+                entity_data["id"]: entity_data["entity_id"]
+                for entity_data in entities.values()
+                if "id" in entity_data
+            }
+            # Only cache once the registry itself is cached
+            if self._entities is None:
+                return mapping
+            self._registry_id_map = mapping
+
+        return self._registry_id_map
+
+    def load_registry_index(self) -> RegistryIndex:
+        """Load all registries and return the IDs references are checked against."""
+        # Each registry is loaded once, so a missing one is reported once
         entities = self.load_entity_registry()
-        return {
-            entity_data["id"]: entity_data["entity_id"]
-            for entity_data in entities.values()
-            if "id" in entity_data
-        }
+        self.load_device_registry()
+        self.load_area_registry()
+        return RegistryIndex(
+            self._entity_ids,
+            self._disabled_entity_ids,
+            self._device_ids,
+            self._area_ids,
+            self._map_registry_ids(entities),
+        )
+
+    def validate_file_references(
+        self, file_path: Path, index: Optional[RegistryIndex] = None
+    ) -> bool:
+        """Validate all references in a single file.
 
-    def validate_file_references(self, file_path: Path) -> bool:
-        """Validate all references in a single file."""
+        index, from load_registry_index, saves loading the registries per file.
+        """
         if file_path.name == "secrets.yaml":
             return True  # Skip secrets file
 
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = yaml.load(f, Loader=HAYamlLoader)
+            raw = file_path.read_bytes()
+            data = self._load_config_file(file_path, raw)
         except Exception as e:
             self.errors.append(f"{file_path}: Failed to load YAML - {e}")
             return False
@@ -343,78 +474,106 @@ class ReferenceValidator:
         if data is None:
             return True  # Empty file is valid
 
-        # Extract references
-        entity_refs = self.extract_entity_references(data)
-        device_refs = self.extract_device_references(data)
-        area_refs = self.extract_area_references(data)
-        entity_registry_ids = self.extract_entity_registry_ids(data)
-
-        # Load registries
-        entities = self.load_entity_registry()
-        devices = self.load_device_registry()
-        areas = self.load_area_registry()
-        entity_id_mapping = self.get_entity_registry_id_mapping()
+        # Parsed either way, so syntax errors are still reported, but
+        # nothing in this file could produce a reference
+        if not any(token in raw for token in _REFERENCE_TOKENS):
+            return True
 
-        all_valid = True
+        return self.validate_data_references(data, file_path, index)
 
-        # Validate entity references (normal entity_id format)
-        for entity_id in entity_refs:
-            # Skip UUID-format entity IDs, they're handled separately
-            if self.is_uuid_format(entity_id):
-                continue
+    def _load_config_file(self, file_path: Path, raw: bytes) -> Any:
+        """Parse a config file's contents, as JSON when it has a .json suffix."""
+        # JSON is a subset of YAML, but a JSON parser is much faster
+        if file_path.suffix == ".json":
+            return _parse_json(raw)
+        # libyaml decodes the UTF-8 itself, so hand it the raw bytes
+        return yaml.load(raw, Loader=HAYamlLoader)
 
-            if entity_id not in entities:
-                # Check if it's a disabled entity
-                disabled_entities = {
-                    e["entity_id"]: e
-                    for e in entities.values()
-                    if e.get("disabled_by") is not None
-                }
-
-                if entity_id in disabled_entities:
-                    self.warnings.append(
-                        f"{file_path}: References disabled entity " f"'{entity_id}'"
-                    )
-                else:
-                    self.errors.append(f"{file_path}: Unknown entity '{entity_id}'")
-                    all_valid = False
+    def validate_data_references(
+        self, data: Any, file_path: Path, index: Optional[RegistryIndex] = None
+    ) -> bool:
+        """Validate all references in data already loaded from file_path."""
+        # Extract references
+        (
+            entity_refs,
+            device_refs,
+            area_refs,
+            entity_registry_ids,
+        ) = self.extract_all_references(data)
+
+        # Load registries; only their ID sets are needed here
+        if index is None:
+            index = self.load_registry_index()
+        entity_ids = index.entity_ids
+        device_ids = index.device_ids
+        area_ids = index.area_ids
+        entity_id_mapping = index.registry_id_map
+
+        # Validate entity references (normal entity_id format), skipping
+        # UUID-format entity IDs, they're handled separately
+        unknown_entities = {
+            entity_id
+            for entity_id in entity_refs - entity_ids
+            if not self.is_uuid_format(entity_id)
+        }
+        # Messages are added in bulk, with the file name rendered only once
+        prefix = f"{file_path}: "
+        errors = self.errors
+        warnings = self.warnings
+
+        # Check if it's a disabled entity
+        warnings.extend(
+            f"{prefix}References disabled entity '{entity_id}'"
+            for entity_id in unknown_entities & index.disabled_entity_ids
+        )
+        missing_entities = unknown_entities - index.disabled_entity_ids
+        # Entity IDs are domain.object_id; anything else cannot be in the
+        # registry, so say what is wrong with it instead
+        errors.extend(
+            (
+                f"{prefix}Invalid entity ID '{entity_id}'"
+                if entity_id.count(".") != 1
+                else f"{prefix}Unknown entity '{entity_id}'"
+            )
+            for entity_id in missing_entities
+        )
 
         # Validate entity registry ID references (UUID format)
-        for registry_id in entity_registry_ids:
-            if registry_id not in entity_id_mapping:
-                self.errors.append(
-                    f"{file_path}: Unknown entity registry ID '{registry_id}'"
-                )
-                all_valid = False
-            else:
-                # Check if the mapped entity is disabled
-                actual_entity_id = entity_id_mapping[registry_id]
-                if actual_entity_id in entities:
-                    entity_data = entities[actual_entity_id]
-                    if entity_data.get("disabled_by") is not None:
-                        self.warnings.append(
-                            f"{file_path}: Entity registry ID '{registry_id}' "
-                            f"references disabled entity '{actual_entity_id}'"
-                        )
+        unknown_registry_ids = entity_registry_ids - entity_id_mapping.keys()
+        errors.extend(
+            f"{prefix}Unknown entity registry ID '{registry_id}'"
+            for registry_id in unknown_registry_ids
+        )
+        # Check if the mapped entity is disabled
+        warnings.extend(
+            f"{prefix}Entity registry ID '{registry_id}' "
+            f"references disabled entity '{entity_id_mapping[registry_id]}'"
+            for registry_id in entity_registry_ids - unknown_registry_ids
+            if entity_id_mapping[registry_id] in index.disabled_entity_ids
+        )
 
         # Validate device references
-        for device_id in device_refs:
-            if device_id not in devices:
-                self.errors.append(f"{file_path}: Unknown device '{device_id}'")
-                all_valid = False
+        unknown_devices = device_refs - device_ids
+        errors.extend(
+            f"{prefix}Unknown device '{device_id}'" for device_id in unknown_devices
+        )
 
         # Validate area references
-        for area_id in area_refs:
-            if area_id not in areas:
-                self.warnings.append(f"{file_path}: Unknown area '{area_id}'")
+        warnings.extend(
+            f"{prefix}Unknown area '{area_id}'" for area_id in area_refs - area_ids
+        )
 
-        return all_valid
+        return not (missing_entities or unknown_registry_ids or unknown_devices)
 
     def get_yaml_files(self) -> List[Path]:
         """Get all YAML files to validate."""
-        yaml_files: List[Path] = []
-        for pattern in ["*.yaml", "*.yml"]:
-            yaml_files.extend(self.config_dir.glob(pattern))
+        # One directory listing for both extensions, in a stable order
+        with os.scandir(self.config_dir) as entries:
+            yaml_files = sorted(
+                Path(entry.path)
+                for entry in entries
+                if entry.name.endswith((".yaml", ".yml")) and entry.is_file()
+            )
 
         # Skip blueprints directory - these are templates with !input tags that are expected
         return yaml_files
@@ -430,11 +589,28 @@ class ReferenceValidator:
             self.warnings.append("No YAML files found in config directory")
             return True
 
+        # Load the registries once for all files
+        index = self.load_registry_index()
         all_valid = True
 
-        for file_path in yaml_files:
-            if not self.validate_file_references(file_path):
-                all_valid = False
+        workers = min(os.cpu_count() or 1, len(yaml_files))
+        if len(yaml_files) >= _PARALLEL_MIN_FILES and workers > 1:
+            # Files are independent; merge the results back in file order
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(str(self.config_dir), index),
+            ) as executor:
+                for valid, errors, warnings in executor.map(
+                    _validate_file_in_worker, yaml_files
+                ):
+                    all_valid = all_valid and valid
+                    self.errors.extend(errors)
+                    self.warnings.extend(warnings)
+        else:
+            for file_path in yaml_files:
+                if not self.validate_file_references(file_path, index):
+                    all_valid = False
 
         return all_valid
 
@@ -442,28 +618,29 @@ class ReferenceValidator:
         """Get summary of available entities by domain."""
         entities = self.load_entity_registry()
 
-        summary: Dict[str, DomainSummary] = {}
-        for entity_id, entity_data in entities.items():
-            domain = entity_id.split(".")[0]
-            if domain not in summary:
-                summary[domain] = {
-                    "count": 0,
-                    "enabled": 0,
-                    "disabled": 0,
-                    "examples": [],
-                }
-
-            summary[domain]["count"] += 1
-            if entity_data.get("disabled_by") is None:
-                summary[domain]["enabled"] += 1
-            else:
-                summary[domain]["disabled"] += 1
-
-            # Add some examples
-            if len(summary[domain]["examples"]) < 3:
-                summary[domain]["examples"].append(entity_id)
-
-        return summary
+        # Count in C with Counter; the disabled IDs are already known
+        domains = [entity_id.partition(".")[0] for entity_id in entities]
+        counts = Counter(domains)
+        disabled = Counter(
+            entity_id.partition(".")[0] for entity_id in self._disabled_entity_ids
+        )
+
+        # Add some examples
+        examples: Dict[str, List[str]] = {domain: [] for domain in counts}
+        for domain, entity_id in zip(domains, entities):
+            domain_examples = examples[domain]
+            if len(domain_examples) < 3:
+                domain_examples.append(entity_id)
+
+        return {
+            domain: {
+                "count": count,
+                "enabled": count - disabled[domain],
+                "disabled": disabled[domain],
+                "examples": examples[domain],
+            }
+            for domain, count in counts.items()
+        }
 
     def print_results(self):
         """Print validation results."""
@@ -502,6 +679,29 @@ class ReferenceValidator:
             print("❌ Invalid entity/device references found")
 
 
+# Validator of the current worker process, see _init_worker
+_worker_validator: Optional[ReferenceValidator] = None
+_worker_index: Optional[RegistryIndex] = None
+
+
+def _init_worker(config_dir: str, index: RegistryIndex):
+    """Give a validate_all worker process its own validator and the registries."""
+    global _worker_validator, _worker_index
+    _worker_validator = ReferenceValidator(config_dir)
+    _worker_index = index
+
+
+def _validate_file_in_worker(file_path: Path) -> Tuple[bool, List[str], List[str]]:
+    """Validate one file, returning its result and messages."""
+    validator = _worker_validator
+    valid = validator.validate_file_references(file_path, _worker_index)
+    result = (valid, validator.errors[:], validator.warnings[:])
+    # The validator is reused for the next file
+    validator.errors.clear()
+    validator.warnings.clear()
+    return result
+
+
 def main():
     """Run entity and device reference validation from command line."""
     config_dir = sys.argv[1] if len(sys.argv) > 1 else "config"
@@ -11,6 +11,9 @@ from pathlib import Path
 
 import requests
 
+# Shared across calls so repeated reloads reuse the open connection
+SESSION = requests.Session()
+
 
 def load_env_file():
     """Load environment variables from .env file."""
@@ -40,13 +43,15 @@ def reload_config():
         return False
 
     # Prepare API request
-    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+    SESSION.headers.update(
+        {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+    )
 
     url = f"{ha_url}/api/services/homeassistant/reload_core_config"
 
     try:
         print("🔄 Reloading Home Assistant core configuration...")
-        response = requests.post(url, headers=headers, timeout=30)
+        response = SESSION.post(url, timeout=30)
 
         if response.status_code == 200:
             print("✅ Configuration reloaded successfully!")
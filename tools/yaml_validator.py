@@ -1,66 +1,65 @@
 #!/usr/bin/env python3
 """YAML syntax validator for Home Assistant configuration files."""
 
+import codecs
+import mmap
+import os
 import sys
 from pathlib import Path
-from typing import List
+from typing import Any, List, Optional, Tuple, Union
 
 import yaml
 
+# Larger files are memory-mapped and streamed to the parser, never copied whole
+_MMAP_MIN_SIZE = 1 << 20
+# Slice size for checking the encoding of a mapped file
+_DECODE_CHUNK_SIZE = 1 << 20
 
-class HAYamlLoader(yaml.SafeLoader):
-    """Custom YAML loader that handles Home Assistant specific tags."""
-
-    pass
+# File contents as read into memory or memory-mapped
+_Contents = Union[bytes, mmap.mmap]
 
+# Prefer the libyaml-backed parser; fall back to pure Python if unavailable
+_BaseLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
-def include_constructor(loader, node):
-    """Handle !include tag."""
-    filename = loader.construct_scalar(node)
-    return f"!include {filename}"
 
+class HAYamlLoader(_BaseLoader):
+    """Custom YAML loader that handles Home Assistant specific tags."""
 
-def include_dir_merge_named_constructor(loader, node):
-    """Handle !include_dir_merge_named tag."""
-    dirname = loader.construct_scalar(node)
-    return f"!include_dir_merge_named {dirname}"
-
+    pass
 
-def include_dir_merge_list_constructor(loader, node):
-    """Handle !include_dir_merge_list tag."""
-    dirname = loader.construct_scalar(node)
-    return f"!include_dir_merge_list {dirname}"
 
+# Home Assistant tags whose scalar is kept as "<tag> <value>" instead of resolved
+_HA_TAGS = (
+    "!include",
+    "!include_dir_merge_named",
+    "!include_dir_merge_list",
+    "!include_dir_list",
+    "!input",
+    "!secret",
+)
 
-def include_dir_list_constructor(loader, node):
-    """Handle !include_dir_list tag."""
-    dirname = loader.construct_scalar(node)
-    return f"!include_dir_list {dirname}"
 
+def ha_tag_constructor(loader, node):
+    """Keep a Home Assistant tag and its scalar value as a plain string."""
+    if isinstance(node, yaml.ScalarNode):
+        return f"{node.tag} {node.value}"
+    # Let PyYAML raise its usual error for non-scalar values
+    return f"{node.tag} {loader.construct_scalar(node)}"
 
-def input_constructor(loader, node):
-    """Handle !input tag for blueprints."""
-    input_name = loader.construct_scalar(node)
-    return f"!input {input_name}"
 
+# Register one shared constructor for every Home Assistant tag
+for _tag in _HA_TAGS:
+    HAYamlLoader.add_constructor(_tag, ha_tag_constructor)
 
-def secret_constructor(loader, node):
-    """Handle !secret tag."""
-    secret_name = loader.construct_scalar(node)
-    return f"!secret {secret_name}"
+# Top-level configuration.yaml keys that are no longer used
+_DEPRECATED_KEYS = frozenset({"discovery", "introduction"})
 
+# Keys of which an automation needs at least one, unless it uses a blueprint
+_TRIGGER_KEYS = frozenset({"trigger", "triggers"})
+_ACTION_KEYS = frozenset({"action", "actions"})
 
-# Register custom constructors
-HAYamlLoader.add_constructor("!include", include_constructor)
-HAYamlLoader.add_constructor(
-    "!include_dir_merge_named", include_dir_merge_named_constructor
-)
-HAYamlLoader.add_constructor(
-    "!include_dir_merge_list", include_dir_merge_list_constructor
-)
-HAYamlLoader.add_constructor("!include_dir_list", include_dir_list_constructor)
-HAYamlLoader.add_constructor("!input", input_constructor)
-HAYamlLoader.add_constructor("!secret", secret_constructor)
+# Keys of which a script needs at least one
+_SCRIPT_KEYS = frozenset({"sequence", "use_blueprint"})
 
 
 class YAMLValidator:
@@ -72,27 +71,46 @@ class YAMLValidator:
         self.errors: List[str] = []
         self.warnings: List[str] = []
 
+    def _load_yaml(self, file_path: Path, raw: Optional[_Contents] = None) -> Any:
+        """Parse a YAML file, or its contents when already read."""
+        if raw is None:
+            raw = file_path.read_bytes()
+        # libyaml decodes the UTF-8 itself, so hand it the raw bytes; a mapped
+        # file is read from it in chunks like any other stream
+        return yaml.load(raw, Loader=HAYamlLoader)
+
     def validate_yaml_syntax(self, file_path: Path) -> bool:
         """Validate YAML syntax of a single file."""
+        return self._load_and_validate(file_path)[0]
+
+    def _load_and_validate(
+        self, file_path: Path, raw: Optional[_Contents] = None
+    ) -> Tuple[bool, Any]:
+        """Check a file's YAML syntax, also returning the parsed data."""
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                yaml.load(f, Loader=HAYamlLoader)
-            return True
+            return True, self._load_yaml(file_path, raw)
         except yaml.YAMLError as e:
             self.errors.append(f"{file_path}: YAML syntax error - {e}")
-            return False
+            return False, None
         except UnicodeDecodeError as e:
             self.errors.append(f"{file_path}: Encoding error - {e}")
-            return False
+            return False, None
         except Exception as e:
             self.errors.append(f"{file_path}: Unexpected error - {e}")
-            return False
+            return False, None
 
-    def validate_file_encoding(self, file_path: Path) -> bool:
+    def validate_file_encoding(
+        self, file_path: Path, raw: Optional[_Contents] = None
+    ) -> bool:
         """Ensure file is UTF-8 encoded as required by Home Assistant."""
+        if raw is None:
+            raw = file_path.read_bytes()
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                f.read()
+            # Decode a slice at a time so a mapped file is never copied whole
+            decoder = codecs.getincrementaldecoder("utf-8")()
+            for start in range(0, len(raw), _DECODE_CHUNK_SIZE):
+                decoder.decode(raw[start : start + _DECODE_CHUNK_SIZE])
+            decoder.decode(b"", final=True)
             return True
         except UnicodeDecodeError:
             self.errors.append(f"{file_path}: File must be UTF-8 encoded")
@@ -104,27 +122,28 @@ class YAMLValidator:
             return True
 
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                config = yaml.load(f, Loader=HAYamlLoader)
+            config = self._load_yaml(file_path)
+        except Exception as e:
+            self.errors.append(f"{file_path}: Failed to validate structure - {e}")
+            return False
 
-            if not isinstance(config, dict):
-                self.errors.append(f"{file_path}: Configuration must be a dictionary")
-                return False
+        return self._check_configuration_structure(file_path, config)
 
-            # Check for common configuration issues
-            if "homeassistant" not in config:
-                self.warnings.append(f"{file_path}: Missing 'homeassistant' section")
+    def _check_configuration_structure(self, file_path: Path, config: Any) -> bool:
+        """Check the structure of already parsed configuration.yaml data."""
+        if not isinstance(config, dict):
+            self.errors.append(f"{file_path}: Configuration must be a dictionary")
+            return False
 
-            # Check for deprecated keys
-            deprecated_keys = ["discovery", "introduction"]
-            for key in deprecated_keys:
-                if key in config:
-                    self.warnings.append(f"{file_path}: '{key}' is deprecated")
+        # Check for common configuration issues
+        if "homeassistant" not in config:
+            self.warnings.append(f"{file_path}: Missing 'homeassistant' section")
 
-            return True
-        except Exception as e:
-            self.errors.append(f"{file_path}: Failed to validate structure - {e}")
-            return False
+        # Check for deprecated keys, in a stable order
+        for key in sorted(_DEPRECATED_KEYS & config.keys()):
+            self.warnings.append(f"{file_path}: '{key}' is deprecated")
+
+        return True
 
     def validate_automations_structure(self, file_path: Path) -> bool:
         """Validate automations.yaml structure."""
@@ -132,95 +151,118 @@ class YAMLValidator:
             return True
 
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                automations = yaml.load(f, Loader=HAYamlLoader)
-
-            if automations is None:
-                return True  # Empty file is valid
-
-            if not isinstance(automations, list):
-                self.errors.append(f"{file_path}: Automations must be a list")
-                return False
-
-            all_valid = True
-            for i, automation in enumerate(automations):
-                if not isinstance(automation, dict):
-                    self.errors.append(
-                        f"{file_path}: Automation {i} must be a dictionary"
-                    )
-                    all_valid = False
-                    continue
-
-                # Check required fields (both singular and plural forms are valid)
-                # Blueprint automations use 'use_blueprint' instead of direct triggers/actions
-                if "use_blueprint" not in automation:
-                    if "trigger" not in automation and "triggers" not in automation:
-                        self.errors.append(f"{file_path}: Automation {i} missing 'trigger' or 'triggers'")
-                        all_valid = False
-                    if "action" not in automation and "actions" not in automation:
-                        self.errors.append(f"{file_path}: Automation {i} missing 'action' or 'actions'")
-                        all_valid = False
-
-                # Check for alias (recommended)
-                if "alias" not in automation:
-                    self.warnings.append(
-                        f"{file_path}: Automation {i} missing 'alias' " f"(recommended)"
-                    )
-
-            return all_valid
+            automations = self._load_yaml(file_path)
         except Exception as e:
             self.errors.append(
                 f"{file_path}: Failed to validate automations structure - {e}"
             )
             return False
 
-    def validate_scripts_structure(self, file_path: Path) -> bool:
-        """Validate scripts.yaml structure."""
-        if file_path.name != "scripts.yaml":
-            return True
+        return self._check_automations_structure(file_path, automations)
 
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                scripts = yaml.load(f, Loader=HAYamlLoader)
+    def _check_automations_structure(self, file_path: Path, automations: Any) -> bool:
+        """Check the structure of already parsed automations.yaml data."""
+        if automations is None:
+            return True  # Empty file is valid
 
-            if scripts is None:
-                return True  # Empty file is valid
+        if not isinstance(automations, list):
+            self.errors.append(f"{file_path}: Automations must be a list")
+            return False
 
-            if not isinstance(scripts, dict):
-                self.errors.append(f"{file_path}: Scripts must be a dictionary")
-                return False
+        # Bound once; the loop below may append for every automation
+        errors = self.errors
+        warnings = self.warnings
+        prefix = f"{file_path}: "
 
-            all_valid = True
-            for script_name, script_config in scripts.items():
-                if not isinstance(script_config, dict):
-                    self.errors.append(
-                        f"{file_path}: Script '{script_name}' must be a " f"dictionary"
+        all_valid = True
+        for i, automation in enumerate(automations):
+            if not isinstance(automation, dict):
+                errors.append(f"{prefix}Automation {i} must be a dictionary")
+                all_valid = False
+                continue
+
+            # Check required fields (both singular and plural forms are valid)
+            # Blueprint automations use 'use_blueprint' instead of direct triggers/actions
+            if "use_blueprint" not in automation:
+                if automation.keys().isdisjoint(_TRIGGER_KEYS):
+                    errors.append(
+                        f"{prefix}Automation {i} missing 'trigger' or 'triggers'"
                     )
                     all_valid = False
-                    continue
-
-                # Check required fields
-                # Blueprint scripts use 'use_blueprint' instead of direct sequence
-                if "use_blueprint" not in script_config and "sequence" not in script_config:
-                    self.errors.append(
-                        f"{file_path}: Script '{script_name}' missing required " f"'sequence' or 'use_blueprint'"
+                if automation.keys().isdisjoint(_ACTION_KEYS):
+                    errors.append(
+                        f"{prefix}Automation {i} missing 'action' or 'actions'"
                     )
                     all_valid = False
 
-            return all_valid
+            # Check for alias (recommended)
+            if "alias" not in automation:
+                warnings.append(
+                    f"{prefix}Automation {i} missing 'alias' " f"(recommended)"
+                )
+
+        return all_valid
+
+    def validate_scripts_structure(self, file_path: Path) -> bool:
+        """Validate scripts.yaml structure."""
+        if file_path.name != "scripts.yaml":
+            return True
+
+        try:
+            scripts = self._load_yaml(file_path)
         except Exception as e:
             self.errors.append(
                 f"{file_path}: Failed to validate scripts structure - {e}"
             )
             return False
 
+        return self._check_scripts_structure(file_path, scripts)
+
+    def _check_scripts_structure(self, file_path: Path, scripts: Any) -> bool:
+        """Check the structure of already parsed scripts.yaml data."""
+        if scripts is None:
+            return True  # Empty file is valid
+
+        if not isinstance(scripts, dict):
+            self.errors.append(f"{file_path}: Scripts must be a dictionary")
+            return False
+
+        # Bound once; the loop below may append for every script
+        errors = self.errors
+        prefix = f"{file_path}: "
+
+        all_valid = True
+        for script_name, script_config in scripts.items():
+            if not isinstance(script_config, dict):
+                errors.append(
+                    f"{prefix}Script '{script_name}' must be a " f"dictionary"
+                )
+                all_valid = False
+                continue
+
+            # Check required fields
+            # Blueprint scripts use 'use_blueprint' instead of direct sequence
+            if script_config.keys().isdisjoint(_SCRIPT_KEYS):
+                errors.append(
+                    f"{prefix}Script '{script_name}' missing required "
+                    f"'sequence' or 'use_blueprint'"
+                )
+                all_valid = False
+
+        return all_valid
+
     def get_yaml_files(self) -> List[Path]:
         """Get all YAML files in the config directory."""
-        yaml_files: List[Path] = []
-        for pattern in ["*.yaml", "*.yml"]:
-            yaml_files.extend(self.config_dir.glob(pattern))
+        # One directory listing for both extensions, in a stable order
+        with os.scandir(self.config_dir) as entries:
+            yaml_files = sorted(
+                Path(entry.path)
+                for entry in entries
+                if entry.name.endswith((".yaml", ".yml")) and entry.is_file()
+            )
 
-        # Skip blueprints directory - these are templates and don't need validation
+        # Only the top level is listed, so blueprints/ (templates that don't need
+        # validation), custom_components/ and .storage/ are never parsed
         return yaml_files
 
     def validate_all(self) -> bool:
@@ -234,48 +276,66 @@ class YAMLValidator:
             self.warnings.append("No YAML files found in config directory")
             return True
 
-        all_valid = True
+        # Skip secrets.yaml as it may contain sensitive data
+        yaml_files = [path for path in yaml_files if path.name != "secrets.yaml"]
 
+        all_valid = True
         for file_path in yaml_files:
-            # Skip secrets.yaml as it may contain sensitive data
-            if file_path.name == "secrets.yaml":
-                continue
-
-            if not self.validate_file_encoding(file_path):
+            if not self._validate_one(file_path):
                 all_valid = False
-                continue
 
-            if not self.validate_yaml_syntax(file_path):
-                all_valid = False
-                continue
+        return all_valid
 
-            # Structure validation for specific files
-            self.validate_configuration_structure(file_path)
-            self.validate_automations_structure(file_path)
-            self.validate_scripts_structure(file_path)
+    def _validate_one(self, file_path: Path) -> bool:
+        """Validate one file, reading its contents only once."""
+        # The encoding check and the parser share the contents
+        if file_path.stat().st_size > _MMAP_MIN_SIZE:
+            with open(file_path, "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as raw:
+                    return self._validate_contents(file_path, raw)
+        return self._validate_contents(file_path, file_path.read_bytes())
+
+    def _validate_contents(self, file_path: Path, raw: _Contents) -> bool:
+        """Check the encoding, syntax and structure of a file's contents."""
+        if not self.validate_file_encoding(file_path, raw):
+            return False
 
-        return all_valid
+        syntax_ok, data = self._load_and_validate(file_path, raw)
+        if not syntax_ok:
+            return False
+
+        # Structure validation for specific files, on the data parsed above
+        if file_path.name == "configuration.yaml":
+            self._check_configuration_structure(file_path, data)
+        elif file_path.name == "automations.yaml":
+            self._check_automations_structure(file_path, data)
+        elif file_path.name == "scripts.yaml":
+            self._check_scripts_structure(file_path, data)
+
+        return True
 
     def print_results(self):
         """Print validation results."""
+        # Collect the report and write it in one go
+        lines: List[str] = []
         if self.errors:
-            print("ERRORS:")
-            for error in self.errors:
-                print(f"  ❌ {error}")
-            print()
+            lines.append("ERRORS:")
+            lines.extend(f"  ❌ {error}" for error in self.errors)
+            lines.append("")
 
         if self.warnings:
-            print("WARNINGS:")
-            for warning in self.warnings:
-                print(f"  ⚠️  {warning}")
-            print()
+            lines.append("WARNINGS:")
+            lines.extend(f"  ⚠️  {warning}" for warning in self.warnings)
+            lines.append("")
 
         if not self.errors and not self.warnings:
-            print("✅ All YAML files are valid!")
+            lines.append("✅ All YAML files are valid!")
         elif not self.errors:
-            print("✅ YAML syntax is valid (with warnings)")
+            lines.append("✅ YAML syntax is valid (with warnings)")
         else:
-            print("❌ YAML validation failed")
+            lines.append("❌ YAML validation failed")
+
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 def main():